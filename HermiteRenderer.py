@@ -54,11 +54,7 @@ class HermiteRenderer:
             self.draw_surface.create_oval(x - 4, y - 4, x + 4, y + 4, fill='blue', tags="node")
             self.render_control_lines()
         else:
-            closest_idx, min_dist = None, float('inf')
-            for i, node in enumerate(self.curve_processor.control_nodes):
-                dist = ((node[0] - x) ** 2 + (node[1] - y) ** 2) ** 0.5
-                if dist < min_dist and dist < 25:
-                    min_dist, closest_idx = dist, i
+            closest_idx = self.curve_processor.nearest_node(x, y, 25)
             if closest_idx is not None:
                 self.selected_node = closest_idx
                 node = self.curve_processor.control_nodes[closest_idx]
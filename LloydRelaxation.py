@@ -0,0 +1,48 @@
+import time
+import numpy as np
+from Voronoi import VoronoiDiagram, cell_areas_and_centroids
+
+
+class LloydRelaxation:
+    """Centroidal Voronoi iteration over the sites of a VoronoiDiagram.
+
+    Every step builds a new diagram from scratch (Fortune's sweep keeps no
+    state that could be reused), moves each site to the centroid of its
+    cell clipped to bbox and records timings in self.timings.
+    """
+
+    def __init__(self, input_points, bbox):
+        self.points = np.array(input_points, dtype=float).reshape(-1, 2)
+        self.bbox = tuple(float(v) for v in bbox)
+        self.diagram = None
+        self.timings = []
+
+    def step(self):
+        started = time.perf_counter()
+        self.diagram = VoronoiDiagram(self.points.tolist())
+        self.diagram.construct()
+        built = time.perf_counter()
+
+        vertices, offsets = self.diagram.get_cells(self.bbox)
+        _, centroids = cell_areas_and_centroids(vertices, offsets)
+        moved = np.where(np.isnan(centroids), self.points, centroids)
+        displacement = float(np.max(np.hypot(*(moved - self.points).T))) if len(moved) else 0.0
+        self.points = moved
+        finished = time.perf_counter()
+
+        self.timings.append({
+            'iteration': len(self.timings) + 1,
+            'diagram': built - started,
+            'centroids': finished - built,
+            'total': finished - started,
+            'displacement': displacement,
+        })
+        return displacement
+
+    def run(self, tolerance=0.5, max_iterations=50):
+        if len(self.points) < 2:
+            raise ValueError("Для релаксации Ллойда нужно не менее 2 точек")
+        for _ in range(max_iterations):
+            if self.step() <= tolerance:
+                break
+        return self.points
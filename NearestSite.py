@@ -0,0 +1,123 @@
+import numpy as np
+
+
+class NearestSiteIndex:
+    """Batch nearest-site queries by jump-and-walk over the Delaunay graph.
+
+    A query jumps to the precomputed owner of its coarse grid cell and then
+    walks greedily to closer Delaunay neighbours. On a Delaunay graph a site
+    with no closer neighbour is the nearest site, so the answer is exact.
+    Equal sites are merged into one node before the graph is built, and a
+    query returns the first of them in input order.
+    """
+
+    CHUNK = 1 << 16
+
+    def __init__(self, sites, edges):
+        self.sites = np.array(sites, dtype=float).reshape(-1, 2)
+        if len(self.sites) == 0:
+            raise ValueError("Нет точек для построения индекса")
+        # Duplicates would be separate graph nodes that the triangulation
+        # never links; every alias is mapped to one canonical node instead.
+        self.nodes, self.canonical, alias = np.unique(self.sites, axis=0, return_index=True, return_inverse=True)
+        n = len(self.nodes)
+        edges = alias.reshape(-1)[np.array(edges, dtype=np.int64).reshape(-1, 2)]
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        pairs = np.unique(np.sort(np.concatenate([edges, edges[:, ::-1]]), axis=1), axis=0)
+        both = np.concatenate([pairs, pairs[:, ::-1]])
+        both = both[np.argsort(both[:, 0], kind='stable')]
+        degree = np.bincount(both[:, 0], minlength=n)
+        width = max(int(degree.max()) if len(both) else 0, 1)
+        # Padding with the site itself keeps the walk in place.
+        self.neighbors = np.repeat(np.arange(n)[:, None], width, axis=1)
+        starts = np.concatenate([[0], np.cumsum(degree)])
+        column = np.arange(len(both)) - starts[both[:, 0]]
+        self.neighbors[both[:, 0], column] = both[:, 1]
+        self._build_grid()
+
+    @classmethod
+    def from_voronoi(cls, diagram):
+        sites = [(p.x, p.y) for p in diagram.sites]
+        edges = [(seg.left_site.index, seg.right_site.index) for seg in diagram.segments
+                 if seg.left_site and seg.right_site]
+        return cls(sites, edges)
+
+    @classmethod
+    def from_delaunay(cls, delaunay):
+        sites = list(delaunay.coordinates)
+        index = {}
+        for i, point in enumerate(sites):
+            index.setdefault(tuple(point), i)
+        edges = [(index[tuple(p1)], index[tuple(p2)]) for p1, p2 in delaunay.compute()]
+        return cls(sites, edges)
+
+    def _build_grid(self):
+        n = len(self.nodes)
+        self.grid_min = self.nodes.min(axis=0)
+        extent = np.maximum(self.nodes.max(axis=0) - self.grid_min, 1e-9)
+        self.grid_size = int(np.clip(np.sqrt(n), 1, 256))
+        self.cell = extent / self.grid_size
+        cells = self._cell_of(self.nodes)
+        owners = np.zeros(self.grid_size * self.grid_size, dtype=np.int64)
+        owners[cells] = np.arange(n)
+        gx, gy = np.meshgrid(np.arange(self.grid_size), np.arange(self.grid_size))
+        centers = self.grid_min + (np.stack([gx.ravel(), gy.ravel()], axis=1) + 0.5) * self.cell
+        self.grid_owner = self._walk(centers, owners)
+
+    def _cell_of(self, points):
+        g = np.floor((points - self.grid_min) / self.cell).astype(np.int64)
+        g = np.clip(g, 0, self.grid_size - 1)
+        return g[:, 1] * self.grid_size + g[:, 0]
+
+    def _walk(self, points, current):
+        current = current.copy()
+        sx, sy = self.nodes[:, 0], self.nodes[:, 1]
+        px, py = points[:, 0], points[:, 1]
+        best = (sx[current] - px) ** 2 + (sy[current] - py) ** 2
+        active = np.arange(len(points))
+        while len(active):
+            candidates = self.neighbors[current[active]]
+            dx = sx[candidates] - px[active, None]
+            dy = sy[candidates] - py[active, None]
+            dist = dx * dx + dy * dy
+            pick = np.argmin(dist, axis=1)
+            closest = dist[np.arange(len(active)), pick]
+            improved = closest < best[active]
+            active = active[improved]
+            current[active] = candidates[improved, pick[improved]]
+            best[active] = closest[improved]
+        return current
+
+    def query(self, points):
+        """Owning site index for every row of an (N, 2) array of points."""
+        return self.canonical[self._query_nodes(points)]
+
+    def _query_nodes(self, points):
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        result = np.empty(len(points), dtype=np.int64)
+        for start in range(0, len(points), self.CHUNK):
+            chunk = points[start:start + self.CHUNK]
+            result[start:start + len(chunk)] = self._walk(chunk, self.grid_owner[self._cell_of(chunk)])
+        return result
+
+    def rasterize(self, width, height, block=None):
+        """Owner of every pixel of a width x height image, shape (height, width).
+
+        Voronoi cells are convex, so a block whose four corners share an owner
+        lies entirely in that cell; only blocks crossed by an edge are walked
+        pixel by pixel, starting from the block's corner owner.
+        """
+        if block is None:
+            block = int(np.clip(np.sqrt(width * height / len(self.nodes)) / 8, 2, 8))
+        xs = np.arange(0, width + block, block, dtype=float)
+        ys = np.arange(0, height + block, block, dtype=float)
+        gx, gy = np.meshgrid(xs, ys)
+        corners = self._query_nodes(np.stack([gx.ravel(), gy.ravel()], axis=1)).reshape(gy.shape)
+        uniform = ((corners[:-1, :-1] == corners[:-1, 1:]) & (corners[:-1, :-1] == corners[1:, :-1])
+                   & (corners[:-1, :-1] == corners[1:, 1:]))
+        owners = np.repeat(np.repeat(corners[:-1, :-1], block, axis=0), block, axis=1)[:height, :width]
+        mixed = np.repeat(np.repeat(~uniform, block, axis=0), block, axis=1)[:height, :width]
+        pys, pxs = np.nonzero(mixed)
+        pixels = np.stack([pxs, pys], axis=1).astype(float)
+        owners[pys, pxs] = self._walk(pixels, owners[pys, pxs])
+        return self.canonical[owners]
@@ -1,4 +1,5 @@
 import numpy as np
+from spatial_grid import SpatialGrid
 
 class HermiteProcessor:
     """Class to handle Hermite curve interpolation with control points and tangents."""
@@ -7,6 +8,7 @@ class HermiteProcessor:
         """Initialize Hermite curve processor with empty nodes and tangents."""
         self.control_nodes = []
         self.tangents = []
+        self.node_index = SpatialGrid(cell=32)
         self.segment_count = 100
         self.hermite_matrix = np.array([
             [2, -2, 1, 1],
@@ -19,11 +21,18 @@ class HermiteProcessor:
         """Add a control point to the curve."""
         self.control_nodes.append(np.array([x, y]))
         self.tangents.append(np.array([0, 0]))
+        self.node_index.insert(len(self.control_nodes) - 1, x, y)
 
     def clear_nodes(self):
         """Reset all control points and tangents."""
         self.control_nodes = []
         self.tangents = []
+        self.node_index.clear()
+
+    def nearest_node(self, x, y, radius):
+        """Index of the control point closest to (x, y) within radius, or None."""
+        hit = self.node_index.nearest(x, y, 1, radius)
+        return hit[0][1] if hit else None
 
     def update_tangents(self):
         """Compute tangents for all control points."""
@@ -1,12 +1,14 @@
 import math
 import heapq
 import itertools
+import numpy as np
 
 
 class Coordinate:
-    def __init__(self, x_coord, y_coord):
+    def __init__(self, x_coord, y_coord, index=None):
         self.x = x_coord
         self.y = y_coord
+        self.index = index
 
 
 class VoronoiEvent:
@@ -28,10 +30,14 @@ class ParabolaArc:
 
 
 class VoronoiSegment:
-    def __init__(self, start_point):
+    def __init__(self, start_point, left_site=None, right_site=None):
         self.start = start_point
         self.end = None
         self.completed = False
+        self.left_site = left_site
+        self.right_site = right_site
+        self.direction = None
+        self.start_direction = None
 
     def complete(self, end_point):
         if not self.completed:
@@ -49,7 +55,7 @@ class EventQueue:
         if event in self.entries:
             return
         count = next(self.counter)
-        entry = [event.x, count, event]
+        entry = [event.x, event.point.y, count, event]
         self.entries[event] = entry
         heapq.heappush(self.queue, entry)
 
@@ -60,7 +66,7 @@ class EventQueue:
 
     def get_next(self):
         while self.queue:
-            _, count, event = heapq.heappop(self.queue)
+            _, _, count, event = heapq.heappop(self.queue)
             if event is not None:
                 del self.entries[event]
                 return event
@@ -68,7 +74,7 @@ class EventQueue:
 
     def peek(self):
         while self.queue:
-            _, count, event = heapq.heappop(self.queue)
+            _, _, count, event = heapq.heappop(self.queue)
             if event is not None:
                 del self.entries[event]
                 self.add(event)
@@ -85,9 +91,17 @@ class VoronoiDiagram:
         self.beach_line = None
         self.site_queue = EventQueue()
         self.circle_queue = EventQueue()
+        self.sites = []
         self.bounds = {'left': float('inf'), 'right': float('-inf'), 'top': float('inf'), 'bottom': float('-inf')}
+        seen = set()
         for x, y in input_points:
-            point = Coordinate(x, y)
+            point = Coordinate(x, y, len(self.sites))
+            self.sites.append(point)
+            # A repeated site would split an arc into two with one focus;
+            # only its first occurrence takes part in the sweep.
+            if (x, y) in seen:
+                continue
+            seen.add((x, y))
             self.site_queue.add(VoronoiEvent(x, point))
             self.bounds['left'] = min(self.bounds['left'], x)
             self.bounds['right'] = max(self.bounds['right'], x)
@@ -117,9 +131,9 @@ class VoronoiDiagram:
     def _handle_circle_event(self):
         event = self.circle_queue.get_next()
         if event.is_valid:
-            segment = VoronoiSegment(event.point)
-            self.segments.append(segment)
             arc = event.arc
+            segment = VoronoiSegment(event.point, arc.prev.focus, arc.next.focus)
+            self.segments.append(segment)
             if arc.prev:
                 arc.prev.next = arc.next
                 arc.prev.segment_right = segment
@@ -143,7 +157,7 @@ class VoronoiDiagram:
         while current:
             intersects, intersection_point = self._find_intersection(point, current)
             if intersects:
-                if current.next and not self._find_intersection(point, current.next)[0]:
+                if current.next:
                     current.next.prev = ParabolaArc(current.focus, current, current.next)
                     current.next = current.next.prev
                 else:
@@ -152,10 +166,10 @@ class VoronoiDiagram:
                 current.next.prev = ParabolaArc(point, current, current.next)
                 current.next = current.next.prev
                 current = current.next
-                segment = VoronoiSegment(intersection_point)
+                segment = VoronoiSegment(intersection_point, current.prev.focus, point)
                 self.segments.append(segment)
                 current.prev.segment_right = current.segment_left = segment
-                segment = VoronoiSegment(intersection_point)
+                segment = VoronoiSegment(intersection_point, point, current.next.focus)
                 self.segments.append(segment)
                 current.next.segment_left = current.segment_right = segment
                 self._check_for_circle_event(current, point.x)
@@ -170,7 +184,8 @@ class VoronoiDiagram:
         x = self.bounds['left']
         y = (current.next.focus.y + current.focus.y) / 2
         start = Coordinate(x, y)
-        segment = VoronoiSegment(start)
+        segment = VoronoiSegment(start, current.focus, point)
+        segment.start_direction = (-1.0, 0.0)
         current.segment_right = current.next.segment_left = segment
         self.segments.append(segment)
 
@@ -239,10 +254,133 @@ class VoronoiDiagram:
         l = self.bounds['right'] + (self.bounds['right'] - self.bounds['left']) + (self.bounds['bottom'] - self.bounds['top'])
         current = self.beach_line
         while current and current.next:
-            if current.segment_right:
+            segment = current.segment_right
+            if segment and not segment.completed:
                 point = self._parabola_intersection(current.focus, current.next.focus, l * 2)
-                current.segment_right.complete(point)
+                segment.complete(point)
+                segment.direction = self._ray_direction(current.focus, current.next.focus)
             current = current.next
 
+    def _ray_direction(self, upper, lower):
+        # The breakpoint of two neighbouring arcs escapes to the right of upper -> lower.
+        dx, dy = lower.y - upper.y, upper.x - lower.x
+        length = math.hypot(dx, dy)
+        if length == 0:
+            return None
+        return dx / length, dy / length
+
     def get_segments(self):
-        return [(seg.start.x, seg.start.y, seg.end.x, seg.end.y) for seg in self.segments if seg.completed]
\ No newline at end of file
+        return [(seg.start.x, seg.start.y, seg.end.x, seg.end.y) for seg in self.segments if seg.completed]
+
+    def get_cells(self, bbox):
+        """Closed Voronoi cells clipped to bbox = (x_min, y_min, x_max, y_max).
+
+        Returns (vertices, offsets): vertices is an (M, 2) float array and the
+        cell of site i is vertices[offsets[i]:offsets[i + 1]], ordered by angle
+        around the cell. Sites are indexed in input order. Open edges are
+        treated as rays, so the result does not depend on the far line used
+        by _finalize_segments.
+        """
+        x_min, y_min, x_max, y_max = (float(v) for v in bbox)
+        if x_min >= x_max or y_min >= y_max:
+            raise ValueError("Некорректная область отсечения")
+        n = len(self.sites)
+        sites = np.array([(p.x, p.y) for p in self.sites], dtype=float).reshape(-1, 2)
+        segments = [seg for seg in self.segments if seg.completed and seg.left_site and seg.right_site]
+        seg = np.array([(s.start.x, s.start.y, s.end.x, s.end.y) for s in segments], dtype=float).reshape(-1, 4)
+        left = np.array([s.left_site.index for s in segments], dtype=np.int64)
+        right = np.array([s.right_site.index for s in segments], dtype=np.int64)
+
+        center = np.array([(x_min + x_max) / 2, (y_min + y_max) / 2])
+        diagonal = np.hypot(x_max - x_min, y_max - y_min)
+        for attr, anchor, moved in (('direction', slice(0, 2), slice(2, 4)), ('start_direction', slice(2, 4), slice(0, 2))):
+            rays = np.array([getattr(s, attr) is not None for s in segments], dtype=bool)
+            if rays.any():
+                direction = np.array([getattr(s, attr) for s in segments if getattr(s, attr) is not None], dtype=float)
+                reach = diagonal + np.hypot(*(seg[rays, anchor] - center).T)
+                seg[rays, moved] = seg[rays, anchor] + direction * reach[:, None]
+
+        clipped, visible = _clip_segments(seg, x_min, y_min, x_max, y_max)
+        clipped, left, right = clipped[visible], left[visible], right[visible]
+
+        corners = np.array([(x_min, y_min), (x_max, y_min), (x_max, y_max), (x_min, y_max)])
+        owners = np.argmin(((corners[:, None, :] - sites[None, :, :]) ** 2).sum(axis=2), axis=1) if n else np.empty(0, dtype=np.int64)
+
+        ids = np.concatenate([left, left, right, right, owners])
+        xy = np.concatenate([clipped[:, :2], clipped[:, 2:], clipped[:, :2], clipped[:, 2:], corners[:len(owners)]])
+        if len(ids) == 0:
+            return np.empty((0, 2)), np.zeros(n + 1, dtype=np.int64)
+
+        counts = np.bincount(ids, minlength=n)
+        centers = np.stack([np.bincount(ids, xy[:, 0], n), np.bincount(ids, xy[:, 1], n)], axis=1)
+        centers /= np.maximum(counts, 1)[:, None]
+        angle = np.arctan2(xy[:, 1] - centers[ids, 1], xy[:, 0] - centers[ids, 0])
+        order = np.lexsort((angle, ids))
+        ids, xy = ids[order], xy[order]
+
+        scale = max(x_max - x_min, y_max - y_min)
+        eps = 1e-9 * scale
+        same_cell = np.r_[False, ids[1:] == ids[:-1]]
+        duplicate = same_cell & np.r_[False, (np.abs(np.diff(xy, axis=0)) <= eps).all(axis=1)]
+        ids, xy = ids[~duplicate], xy[~duplicate]
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(ids, minlength=n))])
+        _, next_idx = _cyclic_neighbours(offsets, ids)
+        wrapped = (next_idx < np.arange(len(ids))) & (np.abs(xy - xy[next_idx]) <= eps).all(axis=1)
+        ids, xy = ids[~wrapped], xy[~wrapped]
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(ids, minlength=n))])
+        prev_idx, next_idx = _cyclic_neighbours(offsets, ids)
+        cross = ((xy[:, 0] - xy[prev_idx, 0]) * (xy[next_idx, 1] - xy[:, 1])
+                 - (xy[:, 1] - xy[prev_idx, 1]) * (xy[next_idx, 0] - xy[:, 0]))
+        collinear = (np.abs(cross) <= eps * scale) & (np.diff(offsets)[ids] > 3)
+        ids, xy = ids[~collinear], xy[~collinear]
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(ids, minlength=n))])
+        return xy, offsets
+
+
+def _clip_segments(seg, x_min, y_min, x_max, y_max):
+    """Liang-Barsky clipping of an (N, 4) segment array against a rectangle."""
+    x0, y0 = seg[:, 0], seg[:, 1]
+    dx, dy = seg[:, 2] - x0, seg[:, 3] - y0
+    p = np.stack([-dx, dx, -dy, dy], axis=1)
+    q = np.stack([x0 - x_min, x_max - x0, y0 - y_min, y_max - y0], axis=1)
+    parallel = p == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = np.where(parallel, 0.0, q / np.where(parallel, 1.0, p))
+    t0 = np.max(np.where(p < 0, r, 0.0), axis=1)
+    t1 = np.min(np.where(p > 0, r, 1.0), axis=1)
+    visible = (t0 <= t1) & ~(parallel & (q < 0)).any(axis=1)
+    clipped = np.stack([x0 + t0 * dx, y0 + t0 * dy, x0 + t1 * dx, y0 + t1 * dy], axis=1)
+    return clipped, visible
+
+
+def _cyclic_neighbours(offsets, ids):
+    index = np.arange(len(ids))
+    start, end = offsets[ids], offsets[ids + 1]
+    prev_idx = np.where(index == start, end - 1, index - 1)
+    next_idx = np.where(index == end - 1, start, index + 1)
+    return prev_idx, next_idx
+
+
+def cell_areas_and_centroids(vertices, offsets):
+    """Vectorized shoelace area and centroid for every cell from get_cells.
+
+    Degenerate cells get the mean of their vertices as centroid (NaN if empty).
+    """
+    n = len(offsets) - 1
+    counts = np.diff(offsets)
+    ids = np.repeat(np.arange(n), counts)
+    if len(ids) == 0:
+        return np.zeros(n), np.full((n, 2), np.nan)
+    _, next_idx = _cyclic_neighbours(offsets, ids)
+    x, y = vertices[:, 0], vertices[:, 1]
+    xn, yn = x[next_idx], y[next_idx]
+    cross = x * yn - xn * y
+    areas = 0.5 * np.bincount(ids, cross, n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cx = np.bincount(ids, (x + xn) * cross, n) / (6 * areas)
+        cy = np.bincount(ids, (y + yn) * cross, n) / (6 * areas)
+        mean_x = np.bincount(ids, x, n) / counts
+        mean_y = np.bincount(ids, y, n) / counts
+    degenerate = np.abs(areas) <= 1e-12
+    centroids = np.stack([np.where(degenerate, mean_x, cx), np.where(degenerate, mean_y, cy)], axis=1)
+    return np.abs(areas), centroids
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""Timings of the convex hull functions.
+
+Run as python bench_hull.py. Covers clouds with few hull vertices (2M
+points) and cocircular points where every point is a hull vertex.
+"""
+import time
+import numpy as np
+from convex_hull import monotone_chain, convex_hull, chan_hull
+
+
+def clouds(rng):
+    n = 2_000_000
+    radius = np.sqrt(rng.uniform(0, 1, n))
+    angle = rng.uniform(0, 2 * np.pi, n)
+    yield "gauss", rng.normal(size=(n, 2))
+    yield "square", rng.uniform(0, 1, (n, 2))
+    yield "disk", np.stack([radius * np.cos(angle), radius * np.sin(angle)], axis=1)
+    circle = rng.uniform(0, 2 * np.pi, 20_000)
+    yield "circle", np.stack([np.cos(circle), np.sin(circle)], axis=1)
+
+
+if __name__ == "__main__":
+    for name, cloud in clouds(np.random.default_rng(0)):
+        for method in (monotone_chain, convex_hull, chan_hull):
+            started = time.perf_counter()
+            hull = method(cloud)
+            print(f"{name:7} n={len(cloud):8} {method.__name__:15} h={len(hull):6} {time.perf_counter() - started:7.3f} s")
@@ -0,0 +1,138 @@
+import time
+from contextlib import contextmanager
+
+
+class CanvasScene:
+    """Retained-mode layer over a Tk canvas.
+
+    Items are grouped (a group is also the canvas tag of its items) and
+    keyed by model objects. update() receives the full content of a group
+    and only touches what differs from the last call: moved items get
+    coords(), restyled items get itemconfig() with the changed options,
+    items whose key is gone are deleted. A group belongs to the layer of
+    its name unless update() names another one. Layers listed in layers
+    stay at the bottom of the canvas in that order, bottom first; other
+    groups are raised to the top whenever they change.
+    """
+
+    def __init__(self, canvas, layers=()):
+        self.canvas = canvas
+        self.layers = list(layers)
+        self.groups = {}
+        self.layer_of = {}
+        self.pending = None
+        self.stats = {"items": 0, "created": 0, "moved": 0, "restyled": 0, "deleted": 0, "ms": 0.0}
+
+    @contextmanager
+    def frame(self):
+        """Defer the updates of one frame to its end.
+
+        Tk repaints only when idle, so this saves no redraws by itself; a
+        group updated several times in the frame is diffed once against
+        its last content, and stats cover the whole frame.
+        """
+        self.pending = {}
+        try:
+            yield self
+        finally:
+            pending, self.pending = self.pending, None
+            started = time.perf_counter()
+            counts = dict.fromkeys(("created", "moved", "restyled", "deleted"), 0)
+            for group, items in pending.items():
+                self._apply(group, items, counts)
+            self._record(counts, started)
+
+    def update(self, group, items, layer=None):
+        """Set the content of a group: (key, kind, coords, options) per item, kind as in create_<kind>."""
+        items = list(items)
+        if layer is not None and layer != group:
+            self.layer_of[group] = layer
+        if self.pending is not None:
+            self.pending.pop(group, None)
+            self.pending[group] = items
+            return
+        started = time.perf_counter()
+        counts = dict.fromkeys(("created", "moved", "restyled", "deleted"), 0)
+        self._apply(group, items, counts)
+        self._record(counts, started)
+
+    def _record(self, counts, started):
+        self.stats.update(counts)
+        self.stats["items"] = sum(len(items) for items in self.groups.values())
+        self.stats["ms"] = (time.perf_counter() - started) * 1000
+
+    def _apply(self, group, items, counts):
+        current = self.groups.setdefault(group, {})
+        layer = self.layer_of.get(group, group)
+        tags = group if layer == group else (group, layer)
+        placed = counts["created"] + counts["moved"]
+        seen = set()
+        for key, kind, coords, options in items:
+            coords = tuple(float(c) for c in coords)
+            entry = current.get(key)
+            seen.add(key)
+            if entry is not None and entry[1] == kind:
+                if entry[2] != coords:
+                    self.canvas.coords(entry[0], *coords)
+                    entry[2] = coords
+                    counts["moved"] += 1
+                changed = {name: value for name, value in options.items() if entry[3].get(name) != value}
+                if changed:
+                    self.canvas.itemconfig(entry[0], **changed)
+                    entry[3].update(changed)
+                    counts["restyled"] += 1
+                continue
+            if entry is not None:
+                self.canvas.delete(entry[0])
+                counts["deleted"] += 1
+            item = getattr(self.canvas, f"create_{kind}")(*coords, tags=tags, **options)
+            current[key] = [item, kind, coords, dict(options)]
+            counts["created"] += 1
+        for key in [key for key in current if key not in seen]:
+            self.canvas.delete(current.pop(key)[0])
+            counts["deleted"] += 1
+        if current and counts["created"] + counts["moved"] > placed:
+            self._restack(group, layer)
+
+    def _present(self, layer):
+        return any(items for group, items in self.groups.items() if self.layer_of.get(group, group) == layer)
+
+    def _restack(self, group, layer):
+        # New items are created on top and coords() keeps the old position,
+        # so the whole group is put back into place after every change.
+        if layer not in self.layers:
+            self.canvas.tag_raise(group)
+            return
+        index = self.layers.index(layer)
+        for above in self.layers[index + 1:]:
+            if self._present(above):
+                self.canvas.tag_lower(group, above)
+                return
+        for below in reversed(self.layers[:index]):
+            if self._present(below):
+                self.canvas.tag_raise(group, below)
+                return
+        self.canvas.tag_lower(group)
+
+    def clear(self, group=None, layer=None):
+        """Delete the items of a group, of every group in a layer, or of all groups."""
+        if group is not None:
+            names = [group]
+        elif layer is not None:
+            names = [name for name in self.groups if self.layer_of.get(name, name) == layer]
+        else:
+            names = list(self.groups)
+        for name in names:
+            self.layer_of.pop(name, None)
+            for entry in self.groups.pop(name, {}).values():
+                self.canvas.delete(entry[0])
+
+    def forget(self):
+        """Drop the bookkeeping after the canvas items were deleted elsewhere."""
+        self.groups.clear()
+        self.layer_of.clear()
+
+    def summary(self):
+        s = self.stats
+        return (f"Элементов: {s['items']}, создано {s['created']}, изменено {s['moved'] + s['restyled']}, "
+                f"удалено {s['deleted']}, {s['ms']:.1f} мс")
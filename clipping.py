@@ -0,0 +1,70 @@
+import numpy as np
+
+CHUNK = 1 << 22
+
+
+def cyrus_beck(segments, x1, y1, nx, ny):
+    """Clip (N, 4) segments x1, y1, x2, y2 to a convex polygon.
+
+    The polygon is given by a point (x1, y1) and an inward normal (nx, ny)
+    per edge. Returns (index, clipped): the rows of the segments that keep
+    a part inside and that part as an (M, 4) array.
+    """
+    segments = np.asarray(segments, dtype=float).reshape(-1, 4)
+    x1, y1, nx, ny = (np.asarray(a, dtype=float) for a in (x1, y1, nx, ny))
+    indices, parts = [], []
+    step = max(1, CHUNK // max(len(x1), 1))
+    for start in range(0, len(segments), step):
+        chunk = segments[start:start + step]
+        px, py = chunk[:, 0:1], chunk[:, 1:2]
+        dx, dy = chunk[:, 2:3] - px, chunk[:, 3:4] - py
+        # n . (P(t) - E) >= 0 inside: num + t * den >= 0.
+        num = (px - x1) * nx + (py - y1) * ny
+        den = dx * nx + dy * ny
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = -num / den
+        t_in = np.max(np.where(den > 0, t, 0.0), axis=1, initial=0.0)
+        t_out = np.min(np.where(den < 0, t, 1.0), axis=1, initial=1.0)
+        outside = np.any((den == 0) & (num < 0), axis=1)
+        keep = np.flatnonzero(~outside & (t_in <= t_out))
+        t_in, t_out = t_in[keep], t_out[keep]
+        px, py, dx, dy = px[keep, 0], py[keep, 0], dx[keep, 0], dy[keep, 0]
+        indices.append(keep + start)
+        parts.append(np.stack([px + t_in * dx, py + t_in * dy, px + t_out * dx, py + t_out * dy], axis=1))
+    if not parts:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 4))
+    return np.concatenate(indices), np.concatenate(parts)
+
+
+def sutherland_hodgman(subject, clip):
+    """Clip an (N, 2) polygon by a convex (M, 2) polygon of either orientation.
+
+    Every clip edge is applied to all subject edges at once. Returns the
+    clipped polygon as a (K, 2) array, empty if nothing is left.
+    """
+    result = np.asarray(subject, dtype=float).reshape(-1, 2)
+    clip = np.asarray(clip, dtype=float).reshape(-1, 2)
+    cx, cy = clip[:, 0], clip[:, 1]
+    orientation = np.sign(np.sum(cx * np.roll(cy, -1) - np.roll(cx, -1) * cy)) or 1.0
+    for (ax, ay), (bx, by) in zip(clip, np.roll(clip, -1, axis=0)):
+        if len(result) == 0:
+            break
+        if ax == bx and ay == by:
+            continue
+        side = orientation * ((bx - ax) * (result[:, 1] - ay) - (by - ay) * (result[:, 0] - ax))
+        inside = side >= 0
+        previous = np.roll(result, 1, axis=0)
+        previous_side = np.roll(side, 1)
+        crossing = inside != np.roll(inside, 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = (previous_side / (previous_side - side))[:, None]
+            # Rows that do not cross may hold inf or nan; only crossing rows are used.
+            cut = previous + t * (result - previous)
+        # Edge previous -> current emits: the cut point when it crosses, then
+        # the current point when it is inside.
+        count = crossing.astype(np.int64) + inside
+        rows = np.repeat(np.arange(len(result)), count)
+        slot = np.arange(len(rows)) - np.repeat(np.cumsum(count) - count, count)
+        first = np.where(crossing[:, None], cut, result)
+        result = np.where((slot == 0)[:, None], first[rows], result[rows])
+    return result
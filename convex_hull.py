@@ -0,0 +1,284 @@
+import os
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+
+def _cross(ox, oy, ax, ay, bx, by):
+    return (ax - ox) * (by - oy) - (ay - oy) * (bx - ox)
+
+
+def extreme_polygon(points):
+    """Indices of the points extreme in eight directions (Akl-Toussaint).
+
+    They are hull points listed counter-clockwise, so no point strictly
+    inside their polygon can be a hull vertex.
+    """
+    x, y = points[:, 0], points[:, 1]
+    candidates = [np.argmin(x), np.argmin(x + y), np.argmin(y), np.argmax(x - y),
+                  np.argmax(x), np.argmax(x + y), np.argmax(y), np.argmax(y - x)]
+    order = []
+    for i in candidates:
+        if not order or (points[i] != points[order[-1]]).any():
+            order.append(int(i))
+    while len(order) > 1 and (points[order[0]] == points[order[-1]]).all():
+        order.pop()
+    return np.array(order, dtype=np.int64)
+
+
+def interior_filter(points, polygon, chunk=1 << 16):
+    """Bool mask of points that may be hull vertices: not strictly inside polygon.
+
+    polygon is convex and counter-clockwise. The points are processed in
+    cache-sized chunks with preallocated buffers.
+    """
+    keep = np.ones(len(points), dtype=bool)
+    if len(polygon) < 3:
+        return keep
+    ax, ay = polygon[:, 0], polygon[:, 1]
+    bx, by = np.roll(ax, -1), np.roll(ay, -1)
+    # cross(a, b, p) = (bx - ax) * py - (by - ay) * px + c for every edge.
+    dx, dy = bx - ax, by - ay
+    c = dy * ax - dx * ay
+    x, y = np.ascontiguousarray(points[:, 0]), np.ascontiguousarray(points[:, 1])
+    inside = np.empty(min(chunk, len(points)), dtype=bool)
+    term = np.empty(len(inside))
+    other = np.empty(len(inside))
+    for start in range(0, len(points), chunk):
+        px, py = x[start:start + chunk], y[start:start + chunk]
+        m = len(px)
+        inside[:m] = True
+        for i in range(len(polygon)):
+            np.multiply(py, dx[i], out=term[:m])
+            np.multiply(px, dy[i], out=other[:m])
+            np.subtract(term[:m], other[:m], out=term[:m])
+            inside[:m] &= term[:m] > -c[i]
+        np.logical_not(inside[:m], out=keep[start:start + m])
+    return keep
+
+
+def monotone_chain(points):
+    """Andrew's monotone chain over an (N, 2) array.
+
+    Returns the indices of the hull vertices counter-clockwise (for y up),
+    starting from the lowest-x point. Duplicates and collinear points are
+    dropped; collinear input gives its two end points.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if len(points) == 0:
+        return np.zeros(0, dtype=np.int64)
+    order = np.lexsort((points[:, 1], points[:, 0]))
+    ordered = points[order]
+    distinct = np.ones(len(order), dtype=bool)
+    distinct[1:] = (ordered[1:] != ordered[:-1]).any(axis=1)
+    order = order[distinct]
+    if len(order) < 3:
+        return order
+    xs, ys = points[order, 0].tolist(), points[order, 1].tolist()
+
+    def chain(indices):
+        stack = []
+        for i in indices:
+            while len(stack) > 1 and _cross(xs[stack[-2]], ys[stack[-2]], xs[stack[-1]], ys[stack[-1]],
+                                            xs[i], ys[i]) <= 0:
+                stack.pop()
+            stack.append(i)
+        return stack
+
+    lower = chain(range(len(order)))
+    upper = chain(range(len(order) - 1, -1, -1))
+    return order[np.array(lower[:-1] + upper[:-1], dtype=np.int64)]
+
+
+def convex_hull(points):
+    """Hull vertex indices of an (N, 2) array, see monotone_chain.
+
+    Points strictly inside the Akl-Toussaint polygon are discarded first,
+    then the survivors are filtered again against the hull of a 32-direction
+    sample of extreme points; only what is left is sorted and chained.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if len(points) < 64:
+        return monotone_chain(points)
+    octagon = extreme_polygon(points)
+    octagon = octagon[monotone_chain(points[octagon])]
+    candidates = np.flatnonzero(interior_filter(points, points[octagon]))
+    if len(candidates) > 1024:
+        x, y = points[candidates, 0], points[candidates, 1]
+        extremes = []
+        for angle in np.linspace(0, 2 * np.pi, 32, endpoint=False):
+            extremes.append(np.argmax(x * np.cos(angle) + y * np.sin(angle)))
+        extremes = candidates[np.unique(extremes)]
+        sample = extremes[monotone_chain(points[extremes])]
+        candidates = candidates[interior_filter(points[candidates], points[sample])]
+    return candidates[monotone_chain(points[candidates])]
+
+
+def _tangent(xs, ys, p, hull, before):
+    """Vertex of a convex CCW hull that every hull point lies left of, seen from p.
+
+    Seen from a hull vertex p all points are within less than a half-turn,
+    so the angles of the hull vertices form one cyclic descent and one
+    ascent; the tangent is the minimum, found by binary search.
+    """
+    k = len(hull)
+    if k <= 2:
+        return hull[0] if k == 1 or before(p, hull[0], hull[1]) else hull[1]
+
+    def falls(i):
+        return before(p, hull[(i + 1) % k], hull[i])
+
+    if falls(0):
+        past = lambda i: not falls(i) or not before(p, hull[i], hull[0])
+    else:
+        past = lambda i: before(p, hull[i], hull[0]) and not falls(i)
+    lo, hi = 1, k
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if past(mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    return hull[lo % k]
+
+
+def _chan(points):
+    """Chan's algorithm over distinct points; hull indices as in monotone_chain.
+
+    For a guess m the points are split into groups of m, each group gets its
+    hull, and at most m gift-wrapping steps are made, each taking the best of
+    the per-group tangents. If the hull does not close, m is squared.
+    """
+    n = len(points)
+    xs, ys = points[:, 0].tolist(), points[:, 1].tolist()
+
+    def before(p, a, b):
+        # a comes before b clockwise around p; of collinear points the farther one.
+        cross = _cross(xs[p], ys[p], xs[a], ys[a], xs[b], ys[b])
+        if cross:
+            return cross > 0
+        return (xs[a] - xs[p]) ** 2 + (ys[a] - ys[p]) ** 2 > (xs[b] - xs[p]) ** 2 + (ys[b] - ys[p]) ** 2
+
+    start = int(np.lexsort((points[:, 1], points[:, 0]))[0])
+    t = 1
+    while True:
+        m = min(1 << (1 << t), n)
+        hulls = [(g + monotone_chain(points[g:g + m])).tolist() for g in range(0, n, m)]
+        successor = {v: hull[(i + 1) % len(hull)] for hull in hulls for i, v in enumerate(hull)}
+        result = [start]
+        p = start
+        for _ in range(m):
+            q = successor[p]
+            for g, hull in enumerate(hulls):
+                if g != p // m:
+                    candidate = _tangent(xs, ys, p, hull, before)
+                    if before(p, candidate, q):
+                        q = candidate
+            if q == start:
+                return np.array(result, dtype=np.int64)
+            result.append(q)
+            p = q
+        t += 1
+
+
+def _chunk_hull(name, shape, start, stop):
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        points = np.ndarray(shape, dtype=float, buffer=block.buf)
+        return start + convex_hull(points[start:stop])
+    finally:
+        block.close()
+
+
+def chan_hull(points, workers=None, chunks=None):
+    """Convex hull of chunk hulls computed in parallel, merged by Chan's algorithm.
+
+    Each chunk goes through convex_hull in a process pool over shared
+    memory, so the cost is that of convex_hull on the chunks: the prefilter
+    plus an O(k log k) sort of each chunk's k survivors. Chan's algorithm
+    (see _chan) only merges the s distinct sub-hull vertices, in
+    O(s log h) steps of Python code; with few hull vertices it is
+    negligible, and when h is close to n it is over ten times slower than
+    monotone_chain. Returns indices as monotone_chain does.
+    """
+    points = np.ascontiguousarray(points, dtype=float).reshape(-1, 2)
+    n = len(points)
+    workers = workers or os.cpu_count() or 1
+    chunks = chunks or 4 * workers
+    bounds = np.linspace(0, n, chunks + 1).astype(np.int64)
+    if workers == 1 or n < 1 << 16:
+        parts = [start + convex_hull(points[start:stop]) for start, stop in zip(bounds[:-1], bounds[1:])]
+    else:
+        block = shared_memory.SharedMemory(create=True, size=points.nbytes)
+        try:
+            np.ndarray(points.shape, dtype=float, buffer=block.buf)[:] = points
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(_chunk_hull, [block.name] * chunks, [points.shape] * chunks,
+                                      bounds[:-1].tolist(), bounds[1:].tolist()))
+        finally:
+            block.close()
+            block.unlink()
+    candidates = np.unique(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.int64)
+    _, first = np.unique(points[candidates], axis=0, return_index=True)
+    candidates = candidates[np.sort(first)]
+    if len(candidates) < 3:
+        return candidates[monotone_chain(points[candidates])]
+    return candidates[_chan(points[candidates])]
+
+
+class OnlineHull:
+    """Convex hull maintained under point insertions.
+
+    The lower and upper chains are x-sorted lists searched with bisect; an
+    insertion locates the point in O(log h), rejects it if it is inside and
+    otherwise splices it in, popping the neighbours it makes non-convex.
+    Every point is popped at most once, but a splice into a Python list
+    shifts its tail, so an insertion that changes the hull costs O(h) in the
+    worst case (a memmove over the h hull vertices, not over all points).
+    """
+
+    def __init__(self):
+        # The upper chain is kept as a lower chain of the mirrored points.
+        self.chains = (([], []), ([], []))
+
+    def __len__(self):
+        return len(self.vertices())
+
+    @staticmethod
+    def _insert(xs, ys, x, y):
+        i = bisect_left(xs, x)
+        if i < len(xs) and xs[i] == x:
+            if ys[i] <= y:
+                return False
+            del xs[i], ys[i]
+        elif 0 < i < len(xs) and _cross(xs[i - 1], ys[i - 1], xs[i], ys[i], x, y) >= 0:
+            return False
+        xs.insert(i, x)
+        ys.insert(i, y)
+        while i + 2 < len(xs) and _cross(x, y, xs[i + 1], ys[i + 1], xs[i + 2], ys[i + 2]) <= 0:
+            del xs[i + 1], ys[i + 1]
+        while i >= 2 and _cross(xs[i - 2], ys[i - 2], xs[i - 1], ys[i - 1], x, y) <= 0:
+            del xs[i - 1], ys[i - 1]
+            i -= 1
+        return True
+
+    def add(self, x, y):
+        """Insert a point; True if the hull changed."""
+        (lx, ly), (ux, uy) = self.chains
+        x, y = float(x), float(y)
+        lower = self._insert(lx, ly, x, y)
+        upper = self._insert(ux, uy, x, -y)
+        return lower or upper
+
+    def vertices(self):
+        """Hull vertices as (x, y) tuples, counter-clockwise for y up."""
+        (lx, ly), (ux, uy) = self.chains
+        lower = list(zip(lx, ly))
+        upper = [(x, -y) for x, y in zip(reversed(ux), reversed(uy))]
+        if upper and lower and upper[0] == lower[-1]:
+            upper = upper[1:]
+        if upper and lower and upper[-1] == lower[0]:
+            upper = upper[:-1]
+        return lower + upper
+
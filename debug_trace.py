@@ -0,0 +1,45 @@
+from collections import deque
+
+_END = object()
+
+
+class DebugTrace:
+    """Indexed view over a lazy sequence of debug steps.
+
+    factory() returns a fresh iterator over the steps. Only the last
+    capacity steps are kept; asking for an older one restarts the iterator
+    and runs it forward again, so memory stays bounded by the buffer while
+    the first step is available as soon as the algorithm yields it.
+    """
+
+    def __init__(self, factory, capacity=4096):
+        self.factory = factory
+        self.capacity = capacity
+        self.total = None
+        self._restart()
+
+    def _restart(self):
+        self.steps = self.factory()
+        self.buffer = deque(maxlen=self.capacity)
+        self.produced = 0
+
+    def __getitem__(self, index):
+        if index < 0 or self.total is not None and index >= self.total:
+            raise IndexError(index)
+        if index < self.produced - len(self.buffer):
+            self._restart()
+        while self.produced <= index:
+            step = next(self.steps, _END)
+            if step is _END:
+                self.total = self.produced
+                raise IndexError(index)
+            self.buffer.append(step)
+            self.produced += 1
+        return self.buffer[index - self.produced + len(self.buffer)]
+
+    def has(self, index):
+        try:
+            self[index]
+        except IndexError:
+            return False
+        return True
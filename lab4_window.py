@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from transform3d import Transform3DRenderer
+from canvas_scene import CanvasScene
 
 class Lab4Window:
     def __init__(self, root):
@@ -59,6 +60,9 @@ class Lab4Window:
         # Холст
         self.canvas = tk.Canvas(self.root, width=self.canvas_width, height=self.canvas_height, bg='white')
         self.canvas.grid(row=0, column=1, padx=10, pady=10)
+        self.scene = CanvasScene(self.canvas)
+        self.scene_label = tk.Label(self.root, text="", bg='lavenderblush2', font=("Segoe UI", 9))
+        self.scene_label.grid(row=1, column=1, sticky='w', padx=10)
 
         # Привязка событий клавиатуры
         self.root.bind('<KeyPress>', self.handle_keypress)
@@ -162,11 +166,11 @@ class Lab4Window:
         self.render_canvas()
 
     def render_canvas(self):
-        self.canvas.delete('all')
         if not self.renderer:
+            self.scene.update("edges", [])
             return
         points = self.renderer.project_to_2d(self.canvas_width, self.canvas_height)
-        for edge in self.renderer.get_edges():
-            x0, y0 = points[edge[0]]
-            x1, y1 = points[edge[1]]
-            self.canvas.create_line(x0, y0, x1, y1, fill='black', width=2)
\ No newline at end of file
+        # Edge lines keep their canvas items and are only moved.
+        self.scene.update("edges", ((i, "line", (*points[a], *points[b]), {"fill": "black", "width": 2})
+                                    for i, (a, b) in enumerate(self.renderer.get_edges())))
+        self.scene_label.config(text=self.scene.summary())
\ No newline at end of file
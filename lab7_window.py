@@ -1,6 +1,9 @@
 import tkinter as tk
 from Delaunay import Delaunay
 from Voronoi import VoronoiDiagram
+from NearestSite import NearestSiteIndex
+from raster_image import photo_from_rgb, site_palette
+from canvas_scene import CanvasScene
 
 
 class Lab7Window:
@@ -14,11 +17,14 @@ class Lab7Window:
 
         self.canvas = tk.Canvas(self.master, width=800, height=600, bg="white")
         self.canvas.pack()
+        self.scene = CanvasScene(self.canvas, layers=("raster", "points", "delaunay", "voronoi"))
 
         self.points = []
         self.mode = "both"  
         self.delaunay_edges = []
         self.voronoi_lines = []
+        self.site_index = None
+        self.raster_image = None
 
         self.canvas.bind("<Button-1>", self.add_point)
         self.canvas.bind("<Button-3>", self.clear_points)
@@ -29,8 +35,11 @@ class Lab7Window:
         tk.Button(button_frame, text="Режим Делоне", command=self.set_delaunay_mode, width=15).pack(side=tk.LEFT, padx=5)
         tk.Button(button_frame, text="Режим Ворони", command=self.set_voronoi_mode, width=15).pack(side=tk.LEFT, padx=5)
         tk.Button(button_frame, text="Оба результата", command=self.set_both_mode, width=15).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="Раскраска", command=self.set_raster_mode, width=15).pack(side=tk.LEFT, padx=5)
         tk.Button(button_frame, text="Рассчитать", command=self.calculate, width=15).pack(side=tk.LEFT, padx=5)
         tk.Button(button_frame, text="Очистить", command=self.clear_points, width=15).pack(side=tk.LEFT, padx=5)
+        self.scene_label = tk.Label(self.master, text="")
+        self.scene_label.pack()
 
         self.draw()
 
@@ -46,6 +55,10 @@ class Lab7Window:
         self.mode = "both"
         self.draw()
 
+    def set_raster_mode(self):
+        self.mode = "raster"
+        self.draw()
+
     def add_point(self, event):
         if not self.LOCK_FLAG and event.x >= 0 and event.x <= 800 and event.y >= 0 and event.y <= 600:
             self.points.append((event.x, event.y))
@@ -56,6 +69,8 @@ class Lab7Window:
         self.points = []
         self.delaunay_edges = []
         self.voronoi_lines = []
+        self.site_index = None
+        self.raster_image = None
         self.draw()
 
     def calculate(self):
@@ -66,17 +81,24 @@ class Lab7Window:
             voronoi = VoronoiDiagram(self.points)
             voronoi.construct()
             self.voronoi_lines = voronoi.get_segments()
+            self.site_index = NearestSiteIndex.from_voronoi(voronoi)
             self.draw()
 
     def draw(self):
-        self.canvas.delete("all")
-        for x, y in self.points:
-            self.canvas.create_oval(x - self.RADIUS, y - self.RADIUS, x + self.RADIUS, y + self.RADIUS, fill="black")
-
-        if self.mode in ["delaunay", "both"] and self.delaunay_edges:
-            for (p1, p2) in self.delaunay_edges:
-                self.canvas.create_line(p1[0], p1[1], p2[0], p2[1], fill="blue")
-
-        if self.mode in ["voronoi", "both"] and self.voronoi_lines:
-            for line in self.voronoi_lines:
-                self.canvas.create_line(line[0], line[1], line[2], line[3], fill="red")
\ No newline at end of file
+        r = self.RADIUS
+        with self.scene.frame():
+            raster = []
+            if self.mode == "raster" and self.site_index:
+                if self.raster_image is None:
+                    owners = self.site_index.rasterize(800, 600)
+                    self.raster_image = photo_from_rgb(site_palette(len(self.points))[owners], self.master)
+                raster.append(("raster", "image", (0, 0), {"image": self.raster_image, "anchor": tk.NW}))
+            self.scene.update("raster", raster)
+            self.scene.update("points", ((i, "oval", (x - r, y - r, x + r, y + r), {"fill": "black"})
+                                         for i, (x, y) in enumerate(self.points)))
+            delaunay = self.delaunay_edges if self.mode in ["delaunay", "both"] else []
+            self.scene.update("delaunay", (((tuple(p1), tuple(p2)), "line", (p1[0], p1[1], p2[0], p2[1]), {"fill": "blue"})
+                                           for p1, p2 in delaunay))
+            voronoi = self.voronoi_lines if self.mode in ["voronoi", "both"] else []
+            self.scene.update("voronoi", ((tuple(line), "line", tuple(line[:4]), {"fill": "red"}) for line in voronoi))
+        self.scene_label.config(text=self.scene.summary())
\ No newline at end of file
@@ -0,0 +1,155 @@
+import numpy as np
+from prepared_polygon import PreparedPolygon
+from segment_sweep import segment_intersections
+
+OPERATIONS = {
+    "union": np.logical_or,
+    "intersection": np.logical_and,
+    "difference": lambda a, b: a & ~b,
+    "xor": np.logical_xor,
+}
+
+
+def _clean_contours(contours):
+    """Closed contours as (k, 2) arrays without repeated consecutive points."""
+    cleaned = []
+    for contour in contours:
+        contour = np.asarray(contour, dtype=float).reshape(-1, 2)
+        keep = (contour != np.roll(contour, -1, axis=0)).any(axis=1)
+        contour = contour[keep]
+        if len(contour) >= 3:
+            cleaned.append(contour)
+    return cleaned
+
+
+def _ring_segments(contours):
+    """Edge arrays of all contours and the index of the edge following each one."""
+    starts = np.concatenate([c for c in contours])
+    ends = np.concatenate([np.roll(c, -1, axis=0) for c in contours])
+    sizes = np.array([len(c) for c in contours])
+    first = np.repeat(np.cumsum(sizes) - sizes, sizes)
+    index = np.arange(len(starts))
+    following = np.where(index + 1 - first == np.repeat(sizes, sizes), first, index + 1)
+    return starts, ends, following
+
+
+def _split_fragments(starts, ends, following):
+    """Cut every edge at its crossings with the other edges.
+
+    Both edges of a crossing receive the very same point, so fragments meet
+    exactly and can be chained by coordinates.
+    """
+    found = segment_intersections(starts[:, 0], starts[:, 1], ends[:, 0], ends[:, 1], following.tolist())
+    seg, xs, ys = [], [], []
+    for i, j, x, y in found:
+        di, dj = ends[i] - starts[i], ends[j] - starts[j]
+        if di[0] * dj[1] - di[1] * dj[0] == 0:
+            # Overlapping collinear edges: cut each at the other's end points.
+            for a, b in ((i, j), (j, i)):
+                for point in (starts[b], ends[b]):
+                    seg.append(a)
+                    xs.append(point[0])
+                    ys.append(point[1])
+        else:
+            seg += [i, j]
+            xs += [x, x]
+            ys += [y, y]
+    seg = np.array(seg, dtype=np.int64)
+    cuts = np.stack([np.array(xs, dtype=float), np.array(ys, dtype=float)], axis=1).reshape(-1, 2)
+    d = ends[seg] - starts[seg]
+    t = np.einsum('ij,ij->i', cuts - starts[seg], d) / np.maximum(np.einsum('ij,ij->i', d, d), 1e-300)
+    inner = (t > 0) & (t < 1)
+    n = len(starts)
+    seg = np.concatenate([np.arange(n), np.arange(n), seg[inner]])
+    t = np.concatenate([np.zeros(n), np.ones(n), t[inner]])
+    points = np.concatenate([starts, ends, cuts[inner]])
+    order = np.lexsort((t, seg))
+    seg, points = seg[order], points[order]
+    same = seg[1:] == seg[:-1]
+    distinct = (points[1:] != points[:-1]).any(axis=1)
+    pick = np.flatnonzero(same & distinct)
+    return seg[pick], points[pick], points[pick + 1]
+
+
+def _chain(first, second):
+    """Link directed fragments into closed contours.
+
+    At a vertex with several outgoing fragments the walk takes the first one
+    clockwise from the way it came, which traces each face separately.
+    """
+    outgoing = {}
+    for k, point in enumerate(map(tuple, first.tolist())):
+        outgoing.setdefault(point, []).append(k)
+    used = np.zeros(len(first), dtype=bool)
+    angles = np.arctan2(second[:, 1] - first[:, 1], second[:, 0] - first[:, 0])
+    contours = []
+    for start in range(len(first)):
+        if used[start]:
+            continue
+        ring = []
+        k = start
+        while not used[k]:
+            used[k] = True
+            ring.append(first[k])
+            candidates = [c for c in outgoing.get(tuple(second[k].tolist()), ()) if not used[c]]
+            if not candidates:
+                break
+            back = angles[k] + np.pi
+            k = min(candidates, key=lambda c: (back - angles[c]) % (2 * np.pi) or 2 * np.pi)
+        if len(ring) >= 3:
+            contours.append(_drop_collinear(np.array(ring)))
+    return [c for c in contours if len(c) >= 3]
+
+
+def _drop_collinear(ring):
+    while len(ring) >= 3:
+        prev, nxt = np.roll(ring, 1, axis=0), np.roll(ring, -1, axis=0)
+        cross = (ring[:, 0] - prev[:, 0]) * (nxt[:, 1] - ring[:, 1]) - (ring[:, 1] - prev[:, 1]) * (nxt[:, 0] - ring[:, 0])
+        dot = (ring[:, 0] - prev[:, 0]) * (nxt[:, 0] - ring[:, 0]) + (ring[:, 1] - prev[:, 1]) * (nxt[:, 1] - ring[:, 1])
+        straight = (cross == 0) & (dot > 0)
+        if not straight.any():
+            break
+        # Drop every other straight vertex so that neighbours are re-checked.
+        drop = straight & ~np.roll(straight, 1)
+        ring = ring[~drop]
+    return ring
+
+
+def boolean_operation(subject, clip, operation):
+    """Union, intersection, difference or xor of two sets of contours.
+
+    subject and clip are lists of closed (k, 2) contours; holes and several
+    outer contours are allowed and read with the even-odd rule. The result is
+    a list of contours with the region on the left of every edge (outer
+    contours counter-clockwise for y up, holes clockwise).
+
+    Edges are split at all crossings by the sweep in segment_sweep; a
+    fragment is kept when the points just to its left and right get
+    different results under the operation.
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Неизвестная операция: {operation}")
+    subject, clip = _clean_contours(subject), _clean_contours(clip)
+    contours = subject + clip
+    if not contours:
+        return []
+    starts, ends, following = _ring_segments(contours)
+    seg, first, second = _split_fragments(starts, ends, following)
+    d = second - first
+    length = np.hypot(d[:, 0], d[:, 1])
+    extent = float(np.ptp(np.concatenate([starts, ends]), axis=0).max()) or 1.0
+    offset = (1e-9 * extent / length)[:, None] * np.stack([-d[:, 1], d[:, 0]], axis=1)
+    middle = (first + second) / 2
+    probes = np.concatenate([middle + offset, middle - offset])
+    in_subject = PreparedPolygon.from_contours(subject).contains(probes)
+    in_clip = PreparedPolygon.from_contours(clip).contains(probes)
+    inside = OPERATIONS[operation](in_subject, in_clip)
+    left, right = inside[:len(seg)], inside[len(seg):]
+    boundary = np.flatnonzero(left != right)
+    # Orient every kept fragment with the result on its left; coincident
+    # edges of the two inputs become one fragment.
+    flip = right[boundary]
+    a = np.where(flip[:, None], second[boundary], first[boundary])
+    b = np.where(flip[:, None], first[boundary], second[boundary])
+    _, unique = np.unique(np.concatenate([a, b], axis=1), axis=0, return_index=True)
+    return _chain(a[unique], b[unique])
@@ -1,7 +1,21 @@
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, filedialog, simpledialog
 import numpy as np
-from math import atan2
+from bisect import bisect_left
+from fractions import Fraction
+from math import atan2, ceil, floor
+from raster_fill import polygon_edges, fill_mask, tiled_fill_mask, coverage_mask, mask_to_spans, boundary_mask
+from raster_image import photo_from_rgb
+from segment_sweep import segment_intersections
+from prepared_polygon import PreparedPolygon
+from convex_hull import convex_hull, chan_hull, OnlineHull
+from clipping import cyrus_beck, sutherland_hodgman
+from polygon_boolean import boolean_operation
+from debug_trace import DebugTrace
+from polygon_io import read_contours, write_contours
+from polygon_simplify import douglas_peucker, visvalingam
+from spatial_grid import SpatialGrid
+from canvas_scene import CanvasScene
 
 class Point:
     def __init__(self, x, y):
@@ -22,41 +36,207 @@ class Edge:
     def __repr__(self):
         return f"Ребро({self.p1}, {self.p2})"
 
+class EdgeGeometry:
+    """Edge arrays of a closed polygon: vectors, inward normals, bounding boxes.
+
+    Edge i runs from point i to point i + 1. Inward normals follow the sign
+    of the polygon area, so they stay consistent at reflex vertices.
+    """
+
+    CHUNK = 1 << 22
+
+    def __init__(self, xs, ys):
+        self.x1, self.y1, self.x2, self.y2 = polygon_edges(xs, ys)
+        self.dx, self.dy = self.x2 - self.x1, self.y2 - self.y1
+        self.orientation = np.sign(np.sum(self.x1 * self.y2 - self.x2 * self.y1)) or 1.0
+        self.nx, self.ny = -self.dy * self.orientation, self.dx * self.orientation
+        self.lengths = np.hypot(self.dx, self.dy)
+        self.x_min, self.x_max = np.minimum(self.x1, self.x2), np.maximum(self.x1, self.x2)
+        self.y_min, self.y_max = np.minimum(self.y1, self.y2), np.maximum(self.y1, self.y2)
+
+    def intersect(self, segments):
+        """Crossings of (N, 4) segments x1, y1, x2, y2 with the polygon edges.
+
+        Returns arrays (segment, edge, t, x, y): t is the parameter along the
+        segment. Edges parallel to a segment are skipped.
+        """
+        segments = np.asarray(segments, dtype=float).reshape(-1, 4)
+        found = []
+        step = max(1, self.CHUNK // max(len(self.x1), 1))
+        for start in range(0, len(segments), step):
+            chunk = segments[start:start + step]
+            sx1, sy1, sx2, sy2 = chunk.T
+            # Cheap box overlap first; the exact test runs on overlapping pairs only.
+            overlap = ((np.maximum(sx1, sx2)[:, None] >= self.x_min) & (np.minimum(sx1, sx2)[:, None] <= self.x_max)
+                       & (np.maximum(sy1, sy2)[:, None] >= self.y_min) & (np.minimum(sy1, sy2)[:, None] <= self.y_max))
+            rows, cols = np.nonzero(overlap)
+            ddx, ddy = sx2[rows] - sx1[rows], sy2[rows] - sy1[rows]
+            edx, edy = self.dx[cols], self.dy[cols]
+            wx, wy = self.x1[cols] - sx1[rows], self.y1[cols] - sy1[rows]
+            denom = ddx * edy - ddy * edx
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = (wx * edy - wy * edx) / denom
+                u = (wx * ddy - wy * ddx) / denom
+            hit = (np.abs(denom) >= 1e-6) & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
+            rows, cols, t = rows[hit], cols[hit], t[hit]
+            found.append((rows + start, cols, t, sx1[rows] + t * ddx[hit], sy1[rows] + t * ddy[hit]))
+        if not found:
+            empty = np.zeros(0)
+            return empty.astype(np.int64), empty.astype(np.int64), empty, empty, empty
+        return tuple(np.concatenate(parts) for parts in zip(*found))
+
 class PolygonModel:
     def __init__(self):
         self.points = []
         self.edges = []
+        self.hull = OnlineHull()
+        self._prepared = None
+        self._geometry = None
+        # (vertices, edges) grids, built on the first hit-test and then
+        # updated on every insertion.
+        self._index = None
 
     def add_point(self, x, y):
         point = Point(x, y)
         self.points.append(point)
         if len(self.points) > 1:
             self.edges.append(Edge(self.points[-2], self.points[-1]))
+        self.hull.add(point.x, point.y)
+        if self._index:
+            self._index[0].insert(len(self.points) - 1, point.x, point.y)
+            if len(self.points) > 1:
+                self._index_edge(len(self.edges) - 1)
+        self._invalidate()
         return point
 
     def close_polygon(self):
         if len(self.points) < 3:
             raise ValueError("Для замыкания полигона нужно не менее 3 точек")
         self.edges.append(Edge(self.points[-1], self.points[0]))
+        if self._index:
+            self._index_edge(len(self.edges) - 1)
+        self._invalidate()
 
     def clear(self):
         self.points.clear()
         self.edges.clear()
+        self.hull = OnlineHull()
+        self._index = None
+        self._invalidate()
+
+    def spatial_index(self):
+        if self._index is None:
+            cell = 16.0
+            if len(self.points) > 1:
+                # About a few vertices per cell for dense imported outlines.
+                xs, ys = [p.x for p in self.points], [p.y for p in self.points]
+                area = (max(xs) - min(xs)) * (max(ys) - min(ys))
+                cell = float(np.clip(2 * np.sqrt(area / len(self.points)), 2, 16))
+            self._index = (SpatialGrid(cell), SpatialGrid(cell))
+            for i, p in enumerate(self.points):
+                self._index[0].insert(i, p.x, p.y)
+            for i in range(len(self.edges)):
+                self._index_edge(i)
+        return self._index
+
+    def _index_edge(self, i):
+        edge = self.edges[i]
+        self._index[1].insert(i, edge.p1.x, edge.p1.y, edge.p2.x, edge.p2.y)
+
+    def hit_vertex(self, x, y, radius):
+        """Index of the vertex nearest to (x, y) within radius, or None."""
+        hit = self.spatial_index()[0].nearest(x, y, 1, radius)
+        return hit[0][1] if hit else None
+
+    def hit_edge(self, x, y, radius):
+        """Index of the edge nearest to (x, y) within radius, or None; edge i starts at point i."""
+        hit = self.spatial_index()[1].nearest(x, y, 1, radius)
+        return hit[0][1] if hit else None
+
+    def set_contour(self, contour):
+        """Replace the points by a closed (k, 2) contour."""
+        contour = np.asarray(contour, dtype=float).reshape(-1, 2)
+        if len(contour) < 3:
+            raise ValueError("Для замыкания полигона нужно не менее 3 точек")
+        self.clear()
+        self.points = [Point(x, y) for x, y in contour.tolist()]
+        self.edges = [Edge(a, b) for a, b in zip(self.points, self.points[1:] + self.points[:1])]
+        # Only hull vertices can change the online hull.
+        for x, y in contour[convex_hull(contour)].tolist():
+            self.hull.add(x, y)
+
+    def load(self, path):
+        """Load the outer contour of a .geojson, .wkt or .npy polygon; returns all contours read."""
+        contours = read_contours(path)
+        self.set_contour(contours[0])
+        return contours
+
+    def save(self, path):
+        if len(self.points) < 3:
+            raise ValueError("Нужно 3+ точки для сохранения")
+        write_contours(path, [self.contour()])
+
+    def simplify(self, tolerance, method="douglas_peucker"):
+        """Simplify the polygon in place; returns the number of vertices kept."""
+        contour = self.simplified(tolerance, method)
+        self.set_contour(contour)
+        return len(contour)
+
+    def simplified(self, tolerance, method="douglas_peucker"):
+        """Simplified copy of the contour; Visvalingam removes triangles smaller than tolerance squared."""
+        if len(self.points) < 3:
+            raise ValueError("Нужно 3+ точки для упрощения")
+        if tolerance <= 0:
+            raise ValueError("Допуск должен быть положительным")
+        contour = self.contour()
+        if method == "douglas_peucker":
+            kept = douglas_peucker(contour, tolerance)
+        elif method == "visvalingam":
+            kept = visvalingam(contour, tolerance ** 2)
+        else:
+            raise ValueError(f"Неизвестный метод упрощения: {method}")
+        if len(kept) < 3:
+            raise ValueError("Слишком большой допуск: от полигона не осталось трех точек")
+        return contour[kept]
+
+    def _invalidate(self):
+        self._prepared = None
+        self._geometry = None
+
+    def geometry(self):
+        if len(self.points) < 2:
+            raise ValueError("Недостаточно ребер для вычисления геометрии")
+        if self._geometry is None:
+            self._geometry = EdgeGeometry([p.x for p in self.points], [p.y for p in self.points])
+        return self._geometry
+
+    def prepared(self):
+        if len(self.points) < 3:
+            raise ValueError("Нужно 3+ точки для проверки принадлежности")
+        if self._prepared is None:
+            self._prepared = PreparedPolygon([p.x for p in self.points], [p.y for p in self.points])
+        return self._prepared
 
     def check_self_intersection(self):
+        return bool(self.self_intersections(first_only=True))
+
+    def self_intersections(self, first_only=False):
+        """(edge_i, edge_j, x, y) for every pair of crossing or touching edges.
+
+        Edge i runs from point i to point i + 1; neighbouring edges only count
+        when they fold back onto each other.
+        """
         n = len(self.points)
-        for i in range(n):
-            for j in range(i + 2, n):
-                if i == 0 and j == n - 1:
-                    continue
-                p1, p2 = self.points[i], self.points[(i + 1) % n]
-                q1, q2 = self.points[j], self.points[(j + 1) % n]
-                def ccw(A, B, C):
-                    return (C.y - A.y) * (B.x - A.x) > (B.y - A.y) * (C.x - A.x)
-                if (ccw(p1, q1, q2) != ccw(p2, q1, q2) and
-                    ccw(p1, p2, q1) != ccw(p1, p2, q2)):
-                    return True
-        return False
+        if n < 3:
+            return []
+        xs = np.array([p.x for p in self.points])
+        ys = np.array([p.y for p in self.points])
+        # Repeated points would make zero-length edges that touch both neighbours.
+        edges = np.flatnonzero((xs != np.roll(xs, -1)) | (ys != np.roll(ys, -1)))
+        x1, y1, x2, y2 = (a[edges] for a in polygon_edges(xs, ys))
+        following = np.roll(np.arange(len(edges)), -1).tolist()
+        found = segment_intersections(x1, y1, x2, y2, following, first_only)
+        return [(int(edges[i]), int(edges[j]), x, y) for i, j, x, y in found]
 
     def check_convexity(self):
         if len(self.points) < 3:
@@ -103,232 +283,410 @@ class PolygonModel:
         bottom = min(range(n), key=lambda i: (pts[i].y, pts[i].x))
         hull = []
         p = bottom
-        while True:
+        # Every step adds a distinct hull vertex, so n steps always suffice.
+        for _ in range(n):
             hull.append(pts[p])
-            endpoint = (p + 1) % n
+            endpoint = None
             for j in range(n):
-                if j == p:
+                if pts[j] == pts[p]:
+                    continue
+                if endpoint is None:
+                    endpoint = j
                     continue
                 cross = (pts[endpoint].x - pts[p].x) * (pts[j].y - pts[p].y) - (pts[endpoint].y - pts[p].y) * (pts[j].x - pts[p].x)
-                if cross < 0:
+                # On collinear candidates take the farthest one.
+                if cross < 0 or cross == 0 and ((pts[j].x - pts[p].x) ** 2 + (pts[j].y - pts[p].y) ** 2 >
+                                                (pts[endpoint].x - pts[p].x) ** 2 + (pts[endpoint].y - pts[p].y) ** 2):
                     endpoint = j
-            p = endpoint
-            if p == bottom:
+            if endpoint is None or pts[endpoint] == pts[bottom]:
                 break
+            p = endpoint
         return hull
 
+    def build_hull_monotone(self):
+        if len(self.points) < 3:
+            raise ValueError("Недостаточно точек для построения выпуклой оболочки")
+        coords = np.array([(p.x, p.y) for p in self.points])
+        return [self.points[i] for i in convex_hull(coords)]
+
+    def build_hull_chan(self):
+        if len(self.points) < 3:
+            raise ValueError("Недостаточно точек для построения выпуклой оболочки")
+        coords = np.array([(p.x, p.y) for p in self.points])
+        return [self.points[i] for i in chan_hull(coords)]
+
+    def current_hull(self):
+        if len(self.points) < 3:
+            raise ValueError("Недостаточно точек для построения выпуклой оболочки")
+        return [Point(x, y) for x, y in self.hull.vertices()]
+
     def find_intersections(self, line_p1, line_p2):
         if not self.edges:
             raise ValueError("Недостаточно ребер для поиска пересечений")
-        normals = []
-        n = len(self.points)
-        for i in range(n):
-            p1, p2 = self.points[i], self.points[(i + 1) % n]
-            dx, dy = p2.x - p1.x, p2.y - p1.y
-            normal = (-dy, dx)
-            p3 = self.points[(i + 2) % n]
-            cross = (p2.x - p1.x) * (p3.y - p2.y) - (p2.y - p1.y) * (p3.x - p2.x)
-            if cross < 0:
-                normal = (dy, -dx)
-            normals.append(normal)
-        intersections = []
-        l1_p1, l1_p2 = line_p1, line_p2
-        for side_idx in range(n):
-            p1, p2 = self.points[side_idx], self.points[(side_idx + 1) % n]
-            normal = normals[side_idx]
-            D = (l1_p2.x - l1_p1.x, l1_p2.y - l1_p1.y)
-            W = (l1_p1.x - p1.x, l1_p1.y - p1.y)
-            denom = normal[0] * D[0] + normal[1] * D[1]
-            if abs(denom) < 1e-6:
-                continue
-            t = -(normal[0] * W[0] + normal[1] * W[1]) / denom
-            if 0 <= t <= 1:
-                x = l1_p1.x + t * D[0]
-                y = l1_p1.y + t * D[1]
-                if (min(p1.x, p2.x) <= x <= max(p1.x, p2.x) and
-                        min(p1.y, p2.y) <= y <= max(p1.y, p2.y)):
-                    intersections.append(Point(x, y))
-        return intersections
+        _, edge, _, xs, ys = self.geometry().intersect([(line_p1.x, line_p1.y, line_p2.x, line_p2.y)])
+        order = np.argsort(edge, kind='stable')
+        return [Point(x, y) for x, y in zip(xs[order], ys[order])]
 
     def get_normals(self):
         if not self.edges:
             raise ValueError("Недостаточно ребер для вычисления нормалей")
-        normals = []
-        n = len(self.points)
-        for i in range(n):
-            p1, p2 = self.points[i], self.points[(i + 1) % n]
-            dx, dy = p2.x - p1.x, p2.y - p1.y
-            normal = (-dy, dx)
-            p3 = self.points[(i + 2) % n]
-            cross = (p2.x - p1.x) * (p3.y - p2.y) - (p2.y - p1.y) * (p3.x - p2.x)
-            if cross < 0:
-                normal = (dy, -dx)
-            length = np.sqrt(normal[0]**2 + normal[1]**2)
-            if length > 0:
-                normal = (normal[0] / length * 20, normal[1] / length * 20)
-            normals.append(normal)
-        return normals
+        geometry = self.geometry()
+        scale = np.where(geometry.lengths > 0, 20 / np.where(geometry.lengths > 0, geometry.lengths, 1), 0)
+        return list(zip((geometry.nx * scale).tolist(), (geometry.ny * scale).tolist()))
 
-    def is_inside(self, x, y):
-        point = Point(x, y)
-        inside = False
-        n = len(self.points)
-        for i in range(n):
-            p1, p2 = self.points[i], self.points[(i + 1) % n]
-            if p1.y == p2.y:
-                continue
-            if min(p1.y, p2.y) < point.y <= max(p1.y, p2.y):
-                if p1.y != p2.y:
-                    x_intersect = p1.x + (point.y - p1.y) * (p2.x - p1.x) / (p2.y - p1.y)
-                    if x_intersect == point.x and point.y == min(p1.y, p2.y):
-                        return False
-                    if x_intersect > point.x:
-                        inside = not inside
-        return inside
-
-    def ordered_edge_list_fill(self, debug=False):
+    def _convex_clipper(self):
         if len(self.points) < 3:
-            raise ValueError("Нужно 3+ точки для заполнения")
-        min_y = min(p.y for p in self.points)
-        max_y = max(p.y for p in self.points)
-        edge_list = []
-        n = len(self.points)
-        for i in range(n):
-            p1, p2 = self.points[i], self.points[(i + 1) % n]
-            if p1.y == p2.y:
+            raise ValueError("Нужно 3+ точки для отсечения")
+        if not self.check_convexity():
+            raise ValueError("Отсекатель должен быть выпуклым полигоном")
+        return self.geometry()
+
+    def clip_segments(self, segments):
+        """Cyrus-Beck clipping of (N, 4) segments; returns (index, clipped)."""
+        geometry = self._convex_clipper()
+        return cyrus_beck(segments, geometry.x1, geometry.y1, geometry.nx, geometry.ny)
+
+    def clip_polygon(self, subject):
+        """Sutherland-Hodgman clipping of an (N, 2) polygon by this one."""
+        self._convex_clipper()
+        return sutherland_hodgman(subject, [(p.x, p.y) for p in self.points])
+
+    def contour(self):
+        return np.array([(p.x, p.y) for p in self.points]).reshape(-1, 2)
+
+    def boolean(self, other, operation):
+        """Contours of this polygon combined with other (a PolygonModel or a list of contours)."""
+        if len(self.points) < 3:
+            raise ValueError("Нужно 3+ точки для булевой операции")
+        contours = [other.contour()] if isinstance(other, PolygonModel) else list(other)
+        return boolean_operation([self.contour()], contours, operation)
+
+    def triangulate(self):
+        if len(self.points) < 3:
+            raise ValueError("Нужно 3+ точки для триангуляции")
+        if self.check_self_intersection():
+            raise ValueError("Полигон самопересекающийся, триангуляция невозможна")
+        xs = np.array([p.x for p in self.points])
+        ys = np.array([p.y for p in self.points])
+        triangles = self._ear_clip(xs, ys)
+        return self._flip_to_delaunay(xs, ys, triangles)
+
+    def _ear_clip(self, xs, ys):
+        n = len(xs)
+        area = np.sum(xs * np.roll(ys, -1) - np.roll(xs, -1) * ys)
+        order = list(range(n)) if area > 0 else list(range(n - 1, -1, -1))
+        prev = {order[i]: order[i - 1] for i in range(n)}
+        nxt = {order[i]: order[(i + 1) % n] for i in range(n)}
+        x0, y0 = float(xs.min()), float(ys.min())
+        cell = max(float(xs.max()) - x0, float(ys.max()) - y0, 1e-9) / max(int(np.sqrt(n)), 1)
+        xs, ys = xs.tolist(), ys.tolist()
+
+        def cross(a, b, c):
+            return (xs[b] - xs[a]) * (ys[c] - ys[b]) - (ys[b] - ys[a]) * (xs[c] - xs[b])
+
+        # Only reflex vertices can lie inside an ear; keep them in a uniform grid.
+        grid = {}
+        reflex = set()
+        for i in order:
+            if cross(prev[i], i, nxt[i]) < 0:
+                reflex.add(i)
+                grid.setdefault((int((xs[i] - x0) // cell), int((ys[i] - y0) // cell)), set()).add(i)
+
+        def is_ear(i):
+            a, c = prev[i], nxt[i]
+            if cross(a, i, c) <= 0:
+                return False
+            ax, ay, bx, by, cx, cy = xs[a], ys[a], xs[i], ys[i], xs[c], ys[c]
+            min_x, max_x = min(ax, bx, cx), max(ax, bx, cx)
+            min_y, max_y = min(ay, by, cy), max(ay, by, cy)
+            for gx in range(int((min_x - x0) // cell), int((max_x - x0) // cell) + 1):
+                for gy in range(int((min_y - y0) // cell), int((max_y - y0) // cell) + 1):
+                    for r in grid.get((gx, gy), ()):
+                        px, py = xs[r], ys[r]
+                        if not (min_x <= px <= max_x and min_y <= py <= max_y) or r in (a, i, c):
+                            continue
+                        if (px, py) in ((ax, ay), (bx, by), (cx, cy)):
+                            continue
+                        if ((bx - ax) * (py - ay) - (by - ay) * (px - ax) >= 0
+                                and (cx - bx) * (py - by) - (cy - by) * (px - bx) >= 0
+                                and (ax - cx) * (py - cy) - (ay - cy) * (px - cx) >= 0):
+                            return False
+            return True
+
+        def update(i):
+            if i in reflex and cross(prev[i], i, nxt[i]) >= 0:
+                reflex.discard(i)
+                grid[(int((xs[i] - x0) // cell), int((ys[i] - y0) // cell))].discard(i)
+
+        triangles = []
+        remaining = n
+        current = order[0]
+        stalled = 0
+        while remaining > 3:
+            if stalled > remaining:
+                raise ValueError("Не удалось найти ухо: полигон вырожден")
+            a, c = prev[current], nxt[current]
+            degenerate = cross(a, current, c) == 0
+            if degenerate or is_ear(current):
+                if not degenerate:
+                    triangles.append((a, current, c))
+                nxt[a], prev[c] = c, a
+                remaining -= 1
+                update(a)
+                update(c)
+                # Skipping ahead keeps clipping spread around the boundary,
+                # so ears stay small instead of fanning out from one vertex.
+                current = nxt[c]
+                stalled = 0
+            else:
+                current = c
+                stalled += 1
+        if cross(prev[current], current, nxt[current]) != 0:
+            triangles.append((prev[current], current, nxt[current]))
+        return triangles
+
+    def _flip_to_delaunay(self, xs, ys, triangles):
+        n = len(xs)
+        xs, ys = xs.tolist(), ys.tolist()
+        constrained = {(min(i, (i + 1) % n), max(i, (i + 1) % n)) for i in range(n)}
+        triangles = [list(t) for t in triangles]
+        edge_map = {}
+        for t_id, tri in enumerate(triangles):
+            for k in range(3):
+                a, b = tri[k], tri[(k + 1) % 3]
+                edge_map.setdefault((min(a, b), max(a, b)), []).append(t_id)
+
+        def opposite(tri, a, b):
+            return next(v for v in tri if v != a and v != b)
+
+        # Floating-point filters with Shewchuk's error bounds; a result inside
+        # the bound is recomputed exactly, so cocircular and collinear cases
+        # give exactly 0 and the flips cannot cycle on roundoff.
+        def point(v, exact):
+            return (Fraction(xs[v]), Fraction(ys[v])) if exact else (xs[v], ys[v])
+
+        def orient(a, b, c, exact=False):
+            (px, py), (qx, qy), (rx, ry) = point(a, exact), point(b, exact), point(c, exact)
+            left, right = (qx - px) * (ry - py), (qy - py) * (rx - px)
+            det = left - right
+            if exact or abs(det) > 3.3306690738754716e-16 * (abs(left) + abs(right)):
+                return det
+            return orient(a, b, c, True)
+
+        def in_circle(a, b, c, d, exact=False):
+            # Positive when d is strictly inside the circle of the counter-clockwise a, b, c.
+            (px, py), (ax, ay), (bx, by), (cx, cy) = (point(v, exact) for v in (d, a, b, c))
+            ax, ay, bx, by, cx, cy = ax - px, ay - py, bx - px, by - py, cx - px, cy - py
+            a_lift, b_lift, c_lift = ax * ax + ay * ay, bx * bx + by * by, cx * cx + cy * cy
+            det = a_lift * (bx * cy - by * cx) - b_lift * (ax * cy - ay * cx) + c_lift * (ax * by - ay * bx)
+            if exact:
+                return det
+            permanent = (a_lift * (abs(bx * cy) + abs(by * cx)) + b_lift * (abs(ax * cy) + abs(ay * cx))
+                         + c_lift * (abs(ax * by) + abs(ay * bx)))
+            if abs(det) > 1.1102230246251577e-15 * permanent:
+                return det
+            return in_circle(a, b, c, d, True)
+
+        stack = [e for e, owners in edge_map.items() if len(owners) == 2 and e not in constrained]
+        while stack:
+            edge = stack.pop()
+            owners = edge_map.get(edge)
+            if not owners or len(owners) != 2 or edge in constrained:
                 continue
-            y_start = min(p1.y, p2.y)
-            y_end = max(p1.y, p2.y)
-            x_start = p1.x if p1.y < p2.y else p2.x
-            dx = (p2.x - p1.x) / (p2.y - p1.y) if p1.y != p2.y else 0
-            for y in range(int(y_start), int(y_end)):
-                x = x_start + dx * (y - y_start)
-                edge_list.append((x, y))
-        edge_list.sort(key=lambda p: (p[1], p[0]))
-        pixels = []
-        debug_steps = []
-        i = 0
-        while i < len(edge_list):
-            if i + 1 >= len(edge_list):
-                break
-            x1, y1 = edge_list[i]
-            x2, y2 = edge_list[i + 1]
-            if y1 != y2:
-                i += 1
+            t1, t2 = owners
+            a, b = edge
+            c, d = opposite(triangles[t1], a, b), opposite(triangles[t2], a, b)
+            ccw = orient(a, b, c) > 0
+            if (in_circle(a, b, c, d) if ccw else in_circle(b, a, c, d)) <= 0:
+                continue
+            # The new diagonal c-d must cross a-b: only a strictly convex quad is flipped.
+            side_a, side_b = orient(c, d, a), orient(c, d, b)
+            if not (side_a > 0 > side_b or side_a < 0 < side_b):
                 continue
-            step_pixels = []
-            for x in range(int(x1), int(x2) + 1):
-                step_pixels.append(Point(x, y1))
-            pixels.extend(step_pixels)
-            if debug:
-                debug_steps.append(step_pixels)
-            i += 2
-        return debug_steps if debug else pixels
+            tri = triangles[t1]
+            forward = tri[(tri.index(a) + 1) % 3] == b
+            triangles[t1] = [a, d, c] if forward else [a, c, d]
+            triangles[t2] = [b, c, d] if forward else [b, d, c]
+            del edge_map[edge]
+            edge_map[(min(c, d), max(c, d))] = [t1, t2]
+            for key, old, new in (((min(b, c), max(b, c)), t1, t2), ((min(a, d), max(a, d)), t2, t1)):
+                edge_map[key] = [new if t == old else t for t in edge_map[key]]
+            for key in ((min(a, c), max(a, c)), (min(b, c), max(b, c)), (min(a, d), max(a, d)), (min(b, d), max(b, d))):
+                stack.append(key)
+        return np.array(triangles, dtype=np.int64).reshape(-1, 3)
+
+    def is_inside(self, x, y):
+        if len(self.points) < 3:
+            return False
+        return bool(self.prepared().contains((x, y))[0])
+
+    def ordered_edge_list_fill(self, debug=False, rule="evenodd", workers=1):
+        mask, x0, y0 = self.rasterize(rule, workers)
+        rows, starts, ends = mask_to_spans(mask, x0, y0)
+        if not debug:
+            return list(zip(rows.tolist(), starts.tolist(), ends.tolist()))
+        breaks = np.flatnonzero(np.diff(rows)) + 1
+        bounds = zip(np.r_[0, breaks].tolist(), np.r_[breaks, len(rows)].tolist())
+        return (list(zip(rows[a:b].tolist(), starts[a:b].tolist(), ends[a:b].tolist())) for a, b in bounds if a < b)
+
+    def rasterize(self, rule="evenodd", workers=1):
+        """Polygon mask and its origin; workers != 1 fills bands in a process pool (None: all cores)."""
+        if len(self.points) < 3:
+            raise ValueError("Нужно 3+ точки для заполнения")
+        xs = [p.x for p in self.points]
+        ys = [p.y for p in self.points]
+        x0, y0 = floor(min(xs)), ceil(min(ys))
+        width, height = ceil(max(xs)) - x0 + 1, max(ceil(max(ys)) - y0, 0)
+        if workers != 1:
+            return tiled_fill_mask(*self._edge_arrays(), x0, y0, width, height, rule, workers), x0, y0
+        return fill_mask(*self._edge_arrays(), x0, y0, width, height, rule), x0, y0
+
+    def coverage_fill(self, rule="evenodd"):
+        """Anti-aliased coverage of the pixels around the polygon and its origin."""
+        if len(self.points) < 3:
+            raise ValueError("Нужно 3+ точки для заполнения")
+        xs = [p.x for p in self.points]
+        ys = [p.y for p in self.points]
+        x0, y0 = floor(min(xs)), floor(min(ys))
+        width, height = ceil(max(xs)) - x0 + 1, ceil(max(ys)) - y0 + 1
+        return coverage_mask(*self._edge_arrays(), x0, y0, width, height, rule), x0, y0
+
+    def _edge_arrays(self):
+        return polygon_edges([p.x for p in self.points], [p.y for p in self.points])
 
     def active_edge_list_fill(self, debug=False):
         if len(self.points) < 3:
             raise ValueError("Нужно 3+ точки для заполнения")
-        min_y = min(p.y for p in self.points)
-        max_y = max(p.y for p in self.points)
         n = len(self.points)
-        y_groups = {}
+        # Edge table bucketed by the first integer scanline each edge crosses;
+        # an edge covers scanlines y_start <= y < y_end.
+        edge_table = {}
         for i in range(n):
             p1, p2 = self.points[i], self.points[(i + 1) % n]
             if p1.y == p2.y:
                 continue
-            y_start = min(p1.y, p2.y)
-            y_end = max(p1.y, p2.y)
-            x_start = p1.x if p1.y < p2.y else p2.x
-            dx = (p2.x - p1.x) / (p2.y - p1.y) if p1.y != p2.y else 0
-            edge = (x_start, dx, y_end)
-            if y_start not in y_groups:
-                y_groups[y_start] = []
-            y_groups[y_start].append(edge)
+            low, high = (p1, p2) if p1.y < p2.y else (p2, p1)
+            first_y = ceil(low.y)
+            if first_y >= high.y:
+                continue
+            dx = (high.x - low.x) / (high.y - low.y)
+            edge_table.setdefault(first_y, []).append([low.x + (first_y - low.y) * dx, dx, high.y, low.x, low.y])
+        steps = self._active_edge_steps(edge_table)
+        return steps if debug else [span for step in steps for span in step]
+
+    def _active_edge_steps(self, edge_table):
+        if not edge_table:
+            return
         active_edges = []
-        debug_steps = []
-        pixels = []
-        for y in range(int(min_y), int(max_y) + 1):
-            if y in y_groups:
-                active_edges.extend(y_groups[y])
+        y = min(edge_table)
+        last_y = max(ceil(p.y) for p in self.points)
+        while y < last_y:
             active_edges = [e for e in active_edges if e[2] > y]
-            active_edges.sort(key=lambda e: e[0])
-            step_pixels = []
-            i = 0
-            while i < len(active_edges) - 1:
-                x1, dx1, y_max1 = active_edges[i]
-                x2, dx2, y_max2 = active_edges[i + 1]
-                for x in range(int(x1), int(x2) + 1):
-                    step_pixels.append(Point(x, y))
-                i += 2
-            active_edges = [(x + dx, dx, y_max) for x, dx, y_max in active_edges]
-            if step_pixels:
-                pixels.extend(step_pixels)
-                if debug:
-                    debug_steps.append(step_pixels)
-        return debug_steps if debug else pixels
+            for edge in edge_table.get(y, ()):
+                self._insert_sorted(active_edges, edge)
+            step_spans = []
+            for i in range(0, len(active_edges) - 1, 2):
+                x_start, x_end = ceil(active_edges[i][0]), ceil(active_edges[i + 1][0]) - 1
+                if x_start <= x_end:
+                    step_spans.append((y, x_start, x_end))
+            for edge in active_edges:
+                edge[0] = edge[3] + (y + 1 - edge[4]) * edge[1]
+            # Edges only swap where they cross, so the list stays nearly sorted.
+            for i in range(1, len(active_edges)):
+                edge = active_edges[i]
+                j = i - 1
+                while j >= 0 and active_edges[j][0] > edge[0]:
+                    active_edges[j + 1] = active_edges[j]
+                    j -= 1
+                active_edges[j + 1] = edge
+            if step_spans:
+                yield step_spans
+            y += 1
+
+    @staticmethod
+    def _insert_sorted(active_edges, edge):
+        i = len(active_edges)
+        active_edges.append(edge)
+        while i > 0 and (active_edges[i - 1][0], active_edges[i - 1][1]) > (edge[0], edge[1]):
+            active_edges[i] = active_edges[i - 1]
+            i -= 1
+        active_edges[i] = edge
 
     def simple_seed_fill(self, seed_point, debug=False):
-        if not self.is_inside(seed_point.x, seed_point.y):
-            raise ValueError("Затравочная точка должна быть внутри полигона")
-        stack = [seed_point]
-        filled_pixels = set()
-        debug_steps = []
+        # Pixel by pixel only for debug stepping: a 4-connected flood reaches
+        # exactly the free runs the span walk reaches, so the result is shared.
+        if debug:
+            return self._simple_seed_steps(*self._seed_bitmap(seed_point))
+        return self.scanline_seed_fill(seed_point)
+
+    @staticmethod
+    def _simple_seed_steps(free, x0, y0, sx, sy):
+        height, width = free.shape
+        stack = [(sx, sy)]
+        free[sy, sx] = False
         while stack:
-            current_step = []
-            point = stack.pop()
-            x, y = point.x, point.y
-            if (x, y) in filled_pixels:
-                continue
-            filled_pixels.add((x, y))
-            current_step.append(Point(x, y))
-            neighbors = [Point(x+1, y), Point(x-1, y), Point(x, y+1), Point(x, y-1)]
-            for neighbor in neighbors:
-                if self.is_inside(neighbor.x, neighbor.y) and (neighbor.x, neighbor.y) not in filled_pixels:
-                    stack.append(neighbor)
-            if current_step and debug:
-                debug_steps.append(current_step)
-        return debug_steps if debug else [Point(x, y) for x, y in filled_pixels]
+            x, y = stack.pop()
+            yield [(y + y0, x + x0, x + x0)]
+            for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if 0 <= nx < width and 0 <= ny < height and free[ny, nx]:
+                    free[ny, nx] = False
+                    stack.append((nx, ny))
 
     def scanline_seed_fill(self, seed_point, debug=False):
-        if not self.is_inside(seed_point.x, seed_point.y):
-            raise ValueError("Затравочная точка должна быть внутри полигона")
-        stack = [seed_point]
-        filled_pixels = set()
-        debug_steps = []
+        steps = self._scanline_seed_steps(*self._seed_bitmap(seed_point))
+        return steps if debug else sorted(span for [span] in steps)
+
+    @staticmethod
+    def _scanline_seed_steps(free, x0, y0, sx, sy):
+        # The maximal free runs of a row are extracted when the walk first
+        # reaches it, and the walk goes from run to overlapping run, so the
+        # work follows the filled rows and runs, not the bounding box.
+        runs = {}
+
+        def row_runs(y):
+            if y not in runs:
+                _, starts, ends = mask_to_spans(free[y:y + 1])
+                runs[y] = (starts.tolist(), ends.tolist())
+            return runs[y]
+
+        starts, ends = row_runs(sy)
+        seed_run = (sy, bisect_left(ends, sx))
+        stack = [seed_run]
+        visited = {seed_run}
         while stack:
-            current_step = []
-            point = stack.pop()
-            x, y = point.x, point.y
-            if (x, y) in filled_pixels:
-                continue
-            x_left = x
-            while self.is_inside(x_left, y) and (x_left, y) not in filled_pixels:
-                filled_pixels.add((x_left, y))
-                current_step.append(Point(x_left, y))
-                x_left -= 1
-            x_left += 1
-            x_right = x + 1
-            while self.is_inside(x_right, y) and (x_right, y) not in filled_pixels:
-                filled_pixels.add((x_right, y))
-                current_step.append(Point(x_right, y))
-                x_right += 1
-            x_right -= 1
-            for scan_y in [y-1, y+1]:
-                scan_x = x_left
-                while scan_x <= x_right:
-                    if self.is_inside(scan_x, scan_y) and (scan_x, scan_y) not in filled_pixels:
-                        stack.append(Point(scan_x, scan_y))
-                        break
-                    scan_x += 1
-                scan_x = x_right
-                while scan_x >= x_left:
-                    if self.is_inside(scan_x, scan_y) and (scan_x, scan_y) not in filled_pixels:
-                        stack.append(Point(scan_x, scan_y))
-                        break
-                    scan_x -= 1
-            if current_step and debug:
-                debug_steps.append(current_step)
-        return debug_steps if debug else [Point(x, y) for x, y in filled_pixels]
+            y, j = stack.pop()
+            starts, ends = runs[y]
+            x_left, x_right = starts[j], ends[j]
+            yield [(y + y0, x_left + x0, x_right + x0)]
+            for scan_y in (y - 1, y + 1):
+                if not 0 <= scan_y < free.shape[0]:
+                    continue
+                starts, ends = row_runs(scan_y)
+                k = bisect_left(ends, x_left)
+                while k < len(starts) and starts[k] <= x_right:
+                    if (scan_y, k) not in visited:
+                        visited.add((scan_y, k))
+                        stack.append((scan_y, k))
+                    k += 1
+
+    def _seed_bitmap(self, seed_point):
+        """Free-pixel bitmap of the polygon bounding box and the seed in it.
+
+        The boundary is drawn in one vectorized pass over the edges; the
+        bitmap itself is one O(bbox) NumPy allocation, everything else in
+        the seed fills follows the filled region.
+        """
+        if len(self.points) < 3 or not self.is_inside(seed_point.x, seed_point.y):
+            raise ValueError("Затравочная точка должна быть внутри полигона")
+        xs = [p.x for p in self.points]
+        ys = [p.y for p in self.points]
+        x0, y0 = floor(min(xs)) - 1, floor(min(ys)) - 1
+        width, height = ceil(max(xs)) - x0 + 2, ceil(max(ys)) - y0 + 2
+        free = ~boundary_mask(*self._edge_arrays(), x0, y0, width, height)
+        sx, sy = int(round(seed_point.x)) - x0, int(round(seed_point.y)) - y0
+        if not free[sy, sx]:
+            raise ValueError("Затравочная точка лежит на границе полигона")
+        return free, x0, y0, sx, sy
 
 class PolygonEditor:
     CANVAS_WIDTH = 600
@@ -343,7 +701,12 @@ class PolygonEditor:
         'seed': 'red',
         'normal': 'purple',
         'inside_point': 'blue',
-        'outside_point': 'orange'
+        'outside_point': 'orange',
+        'triangulation': 'gray',
+        'clipped': 'dark green',
+        'operand': 'gray',
+        'boolean': 'dark orange',
+        'hover': 'deep sky blue'
     }
 
     def __init__(self, root, status_var=None):
@@ -352,31 +715,65 @@ class PolygonEditor:
         self.is_drawing = True
         self.line_points = []
         self.line_mode = False
+        self.operand = None
         self.status_var = status_var
         self.setup_ui()
 
     def setup_ui(self):
         self.menu_bar = tk.Menu(self.root)
         self.root.config(menu=self.menu_bar)
+        file_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.menu_bar.add_cascade(label="Файл", menu=file_menu)
+        file_menu.add_command(label="Открыть полигон...", command=self.load_polygon)
+        file_menu.add_command(label="Сохранить полигон...", command=self.save_polygon)
+        file_menu.add_separator()
+        file_menu.add_command(label="Упростить (Дуглас-Пекер)...", command=lambda: self.simplify_polygon("douglas_peucker"))
+        file_menu.add_command(label="Упростить (Висвалингам)...", command=lambda: self.simplify_polygon("visvalingam"))
+
         hull_menu = tk.Menu(self.menu_bar, tearoff=0)
         self.menu_bar.add_cascade(label="Выпуклая оболочка", menu=hull_menu)
         hull_menu.add_command(label="Метод Грэхема", command=self.build_hull_graham)
         hull_menu.add_command(label="Метод Джарвиса", command=self.build_hull_jarvis)
+        hull_menu.add_command(label="Монотонная цепочка", command=self.build_hull_monotone)
+        hull_menu.add_command(label="Алгоритм Чана", command=self.build_hull_chan)
+        hull_menu.add_command(label="Текущая оболочка", command=self.show_current_hull)
+
+        triangulation_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.menu_bar.add_cascade(label="Триангуляция", menu=triangulation_menu)
+        triangulation_menu.add_command(label="Ограниченная триангуляция Делоне", command=self.render_triangulation)
+
+        clip_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.menu_bar.add_cascade(label="Отсечение", menu=clip_menu)
+        clip_menu.add_command(label="Отсечь отрезок (Кирус-Бек)", command=self.clip_line)
+
+        boolean_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.menu_bar.add_cascade(label="Булевы операции", menu=boolean_menu)
+        boolean_menu.add_command(label="Запомнить полигон", command=self.store_operand)
+        boolean_menu.add_command(label="Объединение", command=lambda: self.render_boolean("union"))
+        boolean_menu.add_command(label="Пересечение", command=lambda: self.render_boolean("intersection"))
+        boolean_menu.add_command(label="Разность", command=lambda: self.render_boolean("difference"))
+        boolean_menu.add_command(label="Симметрическая разность", command=lambda: self.render_boolean("xor"))
 
         fill_menu = tk.Menu(self.menu_bar, tearoff=0)
         self.menu_bar.add_cascade(label="Алгоритмы заполнения", menu=fill_menu)
         fill_menu.add_command(label="Растровая развертка с упорядоченным списком ребер", command=lambda: self.set_fill_mode("ordered_edge"))
+        fill_menu.add_command(label="Растровая развертка (правило ненулевого индекса)", command=lambda: self.set_fill_mode("nonzero_edge"))
+        fill_menu.add_command(label="Растровая развертка (многопроцессная, полосами)", command=lambda: self.set_fill_mode("tiled_edge"))
+        fill_menu.add_command(label="Сглаженная заливка (покрытие пикселей)", command=lambda: self.set_fill_mode("coverage"))
         fill_menu.add_command(label="Растровая развертка с активным списком ребер", command=lambda: self.set_fill_mode("active_edge"))
         fill_menu.add_command(label="Заполнение с затравкой (простое)", command=lambda: self.set_fill_mode("simple_seed"))
         fill_menu.add_command(label="Заполнение с затравкой (построчное)", command=lambda: self.set_fill_mode("scanline_seed"))
 
         self.canvas = tk.Canvas(self.root, bg="white", width=self.CANVAS_WIDTH, height=self.CANVAS_HEIGHT)
         self.canvas.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
+        # Fills and the triangulation stay under the polygon outline.
+        self.scene = CanvasScene(self.canvas, layers=("fill", "triangulation"))
         self.control_frame = tk.Frame(self.root, bg='lavenderblush2')
         self.control_frame.grid(row=0, column=0, padx=10, pady=10, sticky="ns")
 
         self.canvas.bind("<Button-1>", self.add_point)
         self.canvas.bind("<Button-3>", self.close_polygon)
+        self.canvas.bind("<Motion>", self.hover)
 
         tk.Button(self.control_frame, text="Очистить", width=20, font=("Segoe UI", 10), 
                  command=self.clear).grid(row=0, column=0, pady=5)
@@ -399,10 +796,19 @@ class PolygonEditor:
                  command=self.next_debug_step).grid(row=8, column=0, pady=5)
         tk.Button(self.control_frame, text="Установить затравку", width=20, font=("Segoe UI", 10), 
                  command=self.start_seed_mode).grid(row=9, column=0, pady=5)
+        self.autoplay_button = tk.Button(self.control_frame, text="Автовоспроизведение", width=20,
+                                         font=("Segoe UI", 10), command=self.toggle_autoplay)
+        self.autoplay_button.grid(row=10, column=0, pady=5)
+        # Default button colour of the platform, restored after highlighting.
+        self.button_bg = self.autoplay_button.cget('bg')
+        self.autoplay_rate = tk.Scale(self.control_frame, from_=1, to=2000, orient=tk.HORIZONTAL, length=160,
+                                      label="Шагов в секунду", bg='lavenderblush2', font=("Segoe UI", 9))
+        self.autoplay_rate.set(20)
+        self.autoplay_rate.grid(row=11, column=0, pady=5)
 
         self.fill_mode_var = tk.StringVar(value="Режим заполнения: не выбран")
         tk.Label(self.control_frame, textvariable=self.fill_mode_var, bg='lavenderblush2', 
-                 font=("Segoe UI", 10)).grid(row=10, column=0, pady=10)
+                 font=("Segoe UI", 10)).grid(row=12, column=0, pady=10)
 
     def add_point(self, event):
         if self.is_drawing and not self.line_mode and not self.point_check_mode:
@@ -458,7 +864,9 @@ class PolygonEditor:
             messagebox.showinfo("Ошибка", str(e))
 
     def clear(self):
+        self.stop_autoplay()
         self.canvas.delete("all")
+        self.scene.forget()
         self.model.clear()
         self.is_drawing = True
         self.line_points.clear()
@@ -466,15 +874,85 @@ class PolygonEditor:
         self.fill_mode = None
         self.fill_mode_var.set("Режим заполнения: не выбран")
         self.debug_mode = False
-        self.debug_button.config(bg='SystemButtonFace')
+        self.debug_button.config(bg=self.button_bg)
         self.debug_step = 0
-        self.debug_data = []
+        self.debug_data = None
+        self.debug_drawn = 0
         self.seed_point = None
         self.seed_mode = False
         self.point_check_mode = False
+        self.render_operand()
         if self.status_var:
             self.status_var.set("Холст очищен")
 
+    def load_polygon(self):
+        path = filedialog.askopenfilename(filetypes=[("Полигоны", "*.geojson *.json *.wkt *.npy")])
+        if not path:
+            return
+        try:
+            contours = read_contours(path)
+            self.clear()
+            self.model.set_contour(self.fit_to_canvas(contours[0]))
+            self.render_polygon()
+            if self.status_var:
+                extra = f", пропущено контуров: {len(contours) - 1}" if len(contours) > 1 else ""
+                self.status_var.set(f"Загружено вершин: {len(self.model.points)}{extra}")
+        except ValueError as e:
+            messagebox.showerror("Ошибка", f"Не удалось загрузить файл: {str(e)}")
+
+    def save_polygon(self):
+        if self.is_drawing:
+            messagebox.showinfo("Ошибка", "Замкните полигон перед сохранением")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".geojson",
+                                            filetypes=[("GeoJSON", "*.geojson"), ("WKT", "*.wkt"), ("NumPy", "*.npy")])
+        if not path:
+            return
+        try:
+            self.model.save(path)
+            if self.status_var:
+                self.status_var.set(f"Полигон сохранен в {path}")
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить файл: {str(e)}")
+
+    def simplify_polygon(self, method):
+        if self.is_drawing:
+            messagebox.showinfo("Ошибка", "Замкните полигон перед упрощением")
+            return
+        tolerance = simpledialog.askfloat("Упрощение", "Допуск (пиксели):", initialvalue=1.0, minvalue=0.0)
+        if tolerance is None:
+            return
+        try:
+            before = len(self.model.points)
+            simplified = self.model.simplified(tolerance, method)
+            self.clear()
+            self.model.set_contour(simplified)
+            self.render_polygon()
+            if self.status_var:
+                self.status_var.set(f"Вершин: {before} -> {len(simplified)}")
+        except ValueError as e:
+            messagebox.showinfo("Ошибка", str(e))
+
+    def fit_to_canvas(self, contour, margin=20):
+        """Scale and shift a contour that does not fit on the canvas into it."""
+        low, high = contour.min(axis=0), contour.max(axis=0)
+        size = np.array([self.CANVAS_WIDTH, self.CANVAS_HEIGHT], dtype=float)
+        if (low >= 0).all() and (high <= size).all():
+            return contour
+        scale = np.min((size - 2 * margin) / np.maximum(high - low, 1e-12))
+        return (contour - low) * scale + margin
+
+    def render_polygon(self):
+        """Draw the closed model polygon; vertex markers only for small polygons."""
+        contour = self.model.contour()
+        closed = np.concatenate([contour, contour[:1]])
+        self.canvas.create_line(*closed.ravel().tolist(), fill=self.COLORS['line'], tags="line")
+        if len(contour) <= 1000:
+            for x, y in contour.tolist():
+                self.canvas.create_oval(x - self.POINT_SIZE, y - self.POINT_SIZE, x + self.POINT_SIZE,
+                                        y + self.POINT_SIZE, fill=self.COLORS['point'])
+        self.is_drawing = False
+
     def check_convexity(self):
         try:
             is_convex = self.model.check_convexity()
@@ -502,15 +980,55 @@ class PolygonEditor:
         except ValueError as e:
             messagebox.showinfo("Ошибка", str(e))
 
+    def build_hull_monotone(self):
+        try:
+            hull = self.model.build_hull_monotone()
+            self.render_hull(hull)
+            if self.status_var:
+                self.status_var.set("Выпуклая оболочка построена (монотонная цепочка)")
+        except ValueError as e:
+            messagebox.showinfo("Ошибка", str(e))
+
+    def build_hull_chan(self):
+        try:
+            hull = self.model.build_hull_chan()
+            self.render_hull(hull)
+            if self.status_var:
+                self.status_var.set("Выпуклая оболочка построена (Чан)")
+        except ValueError as e:
+            messagebox.showinfo("Ошибка", str(e))
+
+    def show_current_hull(self):
+        try:
+            hull = self.model.current_hull()
+            self.render_hull(hull)
+            if self.status_var:
+                self.status_var.set(f"Текущая выпуклая оболочка: {len(hull)} вершин")
+        except ValueError as e:
+            messagebox.showinfo("Ошибка", str(e))
+
     def render_hull(self, hull):
-        self.canvas.delete("hull")
-        for i in range(len(hull)):
-            p1 = hull[i]
-            p2 = hull[(i + 1) % len(hull)]
-            self.canvas.create_line(
-                p1.x, p1.y, p2.x, p2.y,
-                fill=self.COLORS['hull'], tags="hull"
-            )
+        # Keyed by hull position: a rebuilt hull only moves the edges that changed.
+        self.scene.update("hull", (
+            (i, "line", (p1.x, p1.y, p2.x, p2.y), {"fill": self.COLORS['hull']})
+            for i, (p1, p2) in enumerate(zip(hull, hull[1:] + hull[:1]))
+        ))
+
+    def render_triangulation(self):
+        try:
+            if self.is_drawing:
+                raise ValueError("Замкните полигон перед триангуляцией")
+            triangles = self.model.triangulate()
+            points = self.model.points
+            self.scene.update("triangulation", (
+                ((a, b, c), "polygon", (points[a].x, points[a].y, points[b].x, points[b].y, points[c].x, points[c].y),
+                 {"fill": "", "outline": self.COLORS['triangulation']})
+                for a, b, c in triangles.tolist()
+            ))
+            if self.status_var:
+                self.status_var.set(f"Триангуляция построена: {len(triangles)} треугольников")
+        except ValueError as e:
+            messagebox.showinfo("Ошибка", str(e))
 
     def start_line_mode(self):
         if len(self.model.points) < 3:
@@ -532,38 +1050,80 @@ class PolygonEditor:
             if len(self.line_points) != 2:
                 raise ValueError("Нужно выбрать ровно две точки для отрезка")
             intersections = self.model.find_intersections(self.line_points[0], self.line_points[1])
-            self.canvas.delete("intersection")
-            for point in intersections:
-                self.canvas.create_oval(
-                    point.x - self.POINT_SIZE, point.y - self.POINT_SIZE,
-                    point.x + self.POINT_SIZE, point.y + self.POINT_SIZE,
-                    fill=self.COLORS['intersection'], tags="intersection"
-                )
+            r = self.POINT_SIZE
+            self.scene.update("intersection", (
+                (i, "oval", (point.x - r, point.y - r, point.x + r, point.y + r), {"fill": self.COLORS['intersection']})
+                for i, point in enumerate(intersections)
+            ))
             messagebox.showinfo("Результат", f"Найдено пересечений: {len(intersections)}")
             if self.status_var:
                 self.status_var.set(f"Найдено пересечений: {len(intersections)}")
         except ValueError as e:
             messagebox.showinfo("Ошибка", str(e))
 
+    def clip_line(self):
+        try:
+            if self.is_drawing:
+                raise ValueError("Замкните полигон перед отсечением")
+            if len(self.line_points) != 2:
+                raise ValueError("Нужно выбрать ровно две точки для отрезка")
+            p1, p2 = self.line_points
+            _, clipped = self.model.clip_segments([(p1.x, p1.y, p2.x, p2.y)])
+            self.scene.update("clipped", ((i, "line", segment, {"fill": self.COLORS['clipped'], "width": 3})
+                                          for i, segment in enumerate(clipped.tolist())))
+            if self.status_var:
+                self.status_var.set("Отрезок отсечен" if len(clipped) else "Отрезок вне полигона")
+        except ValueError as e:
+            messagebox.showinfo("Ошибка", str(e))
+
+    def store_operand(self):
+        if self.is_drawing or len(self.model.points) < 3:
+            messagebox.showinfo("Ошибка", "Замкните полигон, чтобы запомнить его")
+            return
+        self.operand = self.model.contour()
+        self.render_operand()
+        if self.status_var:
+            self.status_var.set("Полигон запомнен, нарисуйте второй полигон")
+
+    def render_operand(self):
+        operand = [] if self.operand is None else [
+            ("operand", "polygon", self.operand.ravel().tolist(),
+             {"fill": "", "outline": self.COLORS['operand'], "dash": (4, 2)})
+        ]
+        self.scene.update("operand", operand)
+
+    def render_boolean(self, operation):
+        try:
+            if self.operand is None:
+                raise ValueError("Сначала запомните первый полигон")
+            if self.is_drawing:
+                raise ValueError("Замкните второй полигон")
+            contours = self.model.boolean([self.operand], operation)
+            self.scene.update("boolean", (
+                (i, "polygon", contour.ravel().tolist(), {"fill": "", "outline": self.COLORS['boolean'], "width": 3})
+                for i, contour in enumerate(contours)
+            ))
+            if self.status_var:
+                self.status_var.set(f"Результат: контуров {len(contours)}")
+        except ValueError as e:
+            messagebox.showinfo("Ошибка", str(e))
+
     def render_normals(self):
         try:
             if len(self.model.points) < 3 or self.is_drawing:
                 raise ValueError("Замкните полигон перед отображением нормалей")
-            self.canvas.delete("normal")
             normals = self.model.get_normals()
             n = len(self.model.points)
+            items = []
             for i in range(n):
                 p1 = self.model.points[i]
                 p2 = self.model.points[(i + 1) % n]
                 mid_x = (p1.x + p2.x) / 2
                 mid_y = (p1.y + p2.y) / 2
                 normal = normals[i]
-                end_x = mid_x + normal[0]
-                end_y = mid_y + normal[1]
-                self.canvas.create_line(
-                    mid_x, mid_y, end_x, end_y,
-                    fill=self.COLORS['normal'], arrow=tk.LAST, tags="normal"
-                )
+                items.append((i, "line", (mid_x, mid_y, mid_x + normal[0], mid_y + normal[1]),
+                              {"fill": self.COLORS['normal'], "arrow": tk.LAST}))
+            self.scene.update("normal", items)
             if self.status_var:
                 self.status_var.set("Внутренние нормали отображены")
         except ValueError as e:
@@ -582,9 +1142,40 @@ class PolygonEditor:
         if self.status_var:
             self.status_var.set("Режим проверки точки: выберите точку")
 
+    def hover(self, event):
+        """Highlight the vertex or edge under the cursor of a closed polygon."""
+        if self.is_drawing or len(self.model.points) < 3:
+            self.scene.update("hover", [])
+            return
+        vertex = self.model.hit_vertex(event.x, event.y, self.POINT_SIZE + 3)
+        edge = None if vertex is not None else self.model.hit_edge(event.x, event.y, 3)
+        if vertex is not None:
+            p = self.model.points[vertex]
+            r = self.POINT_SIZE + 2
+            self.scene.update("hover", [("hover", "oval", (p.x - r, p.y - r, p.x + r, p.y + r),
+                                         {"outline": self.COLORS['hover'], "width": 2})])
+            if self.status_var:
+                self.status_var.set(f"Вершина {vertex}: ({p.x:g}, {p.y:g})")
+        elif edge is not None:
+            e = self.model.edges[edge]
+            self.scene.update("hover", [("hover", "line", (e.p1.x, e.p1.y, e.p2.x, e.p2.y),
+                                         {"fill": self.COLORS['hover'], "width": 3})])
+            if self.status_var:
+                self.status_var.set(f"Ребро {edge}")
+        else:
+            self.scene.update("hover", [])
+
     def check_point(self, event):
         if self.point_check_mode:
             point = Point(event.x, event.y)
+            edge = self.model.hit_edge(point.x, point.y, 1)
+            if edge is not None:
+                messagebox.showinfo("Результат", f"Точка ({point.x}, {point.y}) лежит на ребре {edge}")
+                if self.status_var:
+                    self.status_var.set(f"Точка ({point.x}, {point.y}) на границе")
+                self.point_check_mode = False
+                self.canvas.bind("<Button-1>", self.add_point)
+                return
             is_inside = self.model.is_inside(point.x, point.y)
             color = self.COLORS['inside_point'] if is_inside else self.COLORS['outside_point']
             self.canvas.create_oval(
@@ -606,7 +1197,10 @@ class PolygonFiller(PolygonEditor):
         self.fill_mode = None
         self.debug_mode = False
         self.debug_step = 0
-        self.debug_data = []
+        self.debug_data = None
+        # Steps 0 .. debug_drawn - 1 are on the canvas, tagged fill_step_<i>.
+        self.debug_drawn = 0
+        self.autoplay_job = None
         self.seed_point = None
         self.seed_mode = False
         self.point_check_mode = False
@@ -646,9 +1240,7 @@ class PolygonFiller(PolygonEditor):
             messagebox.showinfo("Ошибка", "Замкните полигон перед заполнением")
             return
         self.fill_mode = mode
-        self.canvas.delete("fill")
-        self.debug_data = []
-        self.debug_step = 0
+        self.reset_debug()
         if mode in ["simple_seed", "scanline_seed"] and not self.seed_point:
             messagebox.showinfo("Ошибка", "Сначала установите затравочную точку!")
             self.fill_mode = None
@@ -657,6 +1249,9 @@ class PolygonFiller(PolygonEditor):
             return
         mode_names = {
             "ordered_edge": "Растровая развертка с упорядоченным списком ребер",
+            "nonzero_edge": "Растровая развертка (правило ненулевого индекса)",
+            "tiled_edge": "Растровая развертка полосами в пуле процессов",
+            "coverage": "Сглаженная заливка по площади покрытия",
             "active_edge": "Растровая развертка с активным списком ребер",
             "simple_seed": "Заполнение с затравкой (простое)",
             "scanline_seed": "Заполнение с затравкой (построчное)"
@@ -668,38 +1263,45 @@ class PolygonFiller(PolygonEditor):
 
     def toggle_debug_mode(self):
         self.debug_mode = not self.debug_mode
-        self.debug_step = 0
-        self.debug_data = []
-        self.canvas.delete("fill")
-        self.debug_button.config(bg='lightgreen' if self.debug_mode else 'SystemButtonFace')
+        self.reset_debug()
+        self.debug_button.config(bg='lightgreen' if self.debug_mode else self.button_bg)
         messagebox.showinfo("Отладка", f"Режим {'включен' if self.debug_mode else 'выключен'}")
         if self.status_var:
             self.status_var.set(f"Режим отладки {'включен' if self.debug_mode else 'выключен'}")
         if self.fill_mode and self.debug_mode:
             self.fill_polygon()
 
+    def reset_debug(self):
+        self.stop_autoplay()
+        self.scene.clear(layer="fill")
+        self.debug_data = None
+        self.debug_step = 0
+        self.debug_drawn = 0
+
+    def show_debug_steps(self, count):
+        """Bring the canvas to the first count steps, drawing or deleting only the difference."""
+        while self.debug_drawn < count:
+            self.draw_fill(self.debug_data[self.debug_drawn], f"fill_step_{self.debug_drawn}")
+            self.debug_drawn += 1
+        while self.debug_drawn > count:
+            self.debug_drawn -= 1
+            self.scene.clear(f"fill_step_{self.debug_drawn}")
+        if self.status_var:
+            total = self.debug_data.total if self.debug_data.total is not None else "?"
+            self.status_var.set(f"Отладка: шаг {self.debug_step + 1} из {total}")
+
     def prev_debug_step(self):
         if not self.debug_mode or not self.debug_data:
             messagebox.showinfo("Отладка", "Нет данных для отладки")
             if self.status_var:
                 self.status_var.set("Отладка: нет данных")
             return
+        self.stop_autoplay()
         self.debug_step -= 1
         if self.debug_step < 0:
             self.debug_step = 0
             messagebox.showinfo("Отладка", "Начало шагов")
-            if self.status_var:
-                self.status_var.set("Отладка: начало шагов")
-        self.canvas.delete("fill")
-        for i in range(self.debug_step + 1):
-            pixels = self.debug_data[i]
-            for point in pixels:
-                self.canvas.create_rectangle(
-                    point.x, point.y, point.x + 1, point.y + 1,
-                    fill=self.COLORS['fill'], outline="", tags="fill"
-                )
-        if self.status_var:
-            self.status_var.set(f"Отладка: шаг {self.debug_step + 1} из {len(self.debug_data)}")
+        self.show_debug_steps(self.debug_step + 1)
 
     def next_debug_step(self):
         if not self.debug_mode or not self.debug_data:
@@ -707,45 +1309,96 @@ class PolygonFiller(PolygonEditor):
             if self.status_var:
                 self.status_var.set("Отладка: нет данных")
             return
+        self.stop_autoplay()
         self.debug_step += 1
-        if self.debug_step >= len(self.debug_data):
-            self.debug_step = len(self.debug_data) - 1
+        if not self.debug_data.has(self.debug_step):
+            self.debug_step -= 1
             messagebox.showinfo("Отладка", "Конец шагов")
-            if self.status_var:
-                self.status_var.set("Отладка: конец шагов")
-        self.canvas.delete("fill")
-        for i in range(self.debug_step + 1):
-            pixels = self.debug_data[i]
-            for point in pixels:
-                self.canvas.create_rectangle(
-                    point.x, point.y, point.x + 1, point.y + 1,
-                    fill=self.COLORS['fill'], outline="", tags="fill"
-                )
+        self.show_debug_steps(self.debug_step + 1)
+
+    def toggle_autoplay(self):
+        if self.autoplay_job is not None:
+            self.stop_autoplay()
+            return
+        if not self.debug_mode or not self.debug_data:
+            messagebox.showinfo("Отладка", "Нет данных для отладки")
+            return
+        if not self.debug_data.has(self.debug_step + 1):
+            self.debug_step = 0
+            self.show_debug_steps(1)
+        self.autoplay_button.config(bg='lightgreen')
+        self.autoplay_tick()
+
+    def autoplay_tick(self):
+        # Tk timers are not finer than a millisecond, faster rates take
+        # several steps per tick.
+        rate = self.autoplay_rate.get()
+        per_tick = max(1, rate // 1000)
+        for _ in range(per_tick):
+            if not self.debug_data.has(self.debug_step + 1):
+                break
+            self.debug_step += 1
+        self.show_debug_steps(self.debug_step + 1)
+        if not self.debug_data.has(self.debug_step + 1):
+            self.autoplay_job = None
+            self.stop_autoplay()
+            return
+        self.autoplay_job = self.root.after(max(1, 1000 * per_tick // rate), self.autoplay_tick)
+
+    def stop_autoplay(self):
+        if getattr(self, "autoplay_job", None) is not None:
+            self.root.after_cancel(self.autoplay_job)
+        self.autoplay_job = None
+        self.autoplay_button.config(bg=self.button_bg)
+
+    def draw_coverage(self):
+        coverage, x0, y0 = self.model.coverage_fill()
+        color = np.array(self.canvas.winfo_rgb(self.COLORS['fill'])) / 257
+        # Blend the fill color over the white canvas by coverage.
+        rgb = np.rint(255 + coverage[..., None] * (color - 255))
+        self.fill_image = photo_from_rgb(rgb, self.root)
+        self.scene.update("fill", [("coverage", "image", (x0, y0), {"image": self.fill_image, "anchor": tk.NW})])
         if self.status_var:
-            self.status_var.set(f"Отладка: шаг {self.debug_step + 1} из {len(self.debug_data)}")
+            self.status_var.set("Полигон заполнен со сглаживанием")
+
+    def draw_fill(self, spans, group="fill"):
+        # Debug steps get a group each in the fill layer, so stepping back deletes one group.
+        self.scene.update(group, (
+            ((y, x_start, x_end), "rectangle", (x_start, y, x_end + 1, y + 1),
+             {"fill": self.COLORS['fill'], "outline": ""})
+            for y, x_start, x_end in spans
+        ), layer="fill")
+
+    def run_fill(self, debug, mode, seed_point):
+        if mode == "ordered_edge":
+            return self.model.ordered_edge_list_fill(debug)
+        elif mode == "nonzero_edge":
+            return self.model.ordered_edge_list_fill(debug, rule="nonzero")
+        elif mode == "tiled_edge":
+            return self.model.ordered_edge_list_fill(debug, workers=None)
+        elif mode == "active_edge":
+            return self.model.active_edge_list_fill(debug)
+        elif mode == "simple_seed":
+            return self.model.simple_seed_fill(seed_point, debug)
+        elif mode == "scanline_seed":
+            return self.model.scanline_seed_fill(seed_point, debug)
+        return []
 
     def fill_polygon(self):
         try:
             if not self.fill_mode:
                 raise ValueError("Выберите режим заполнения")
-            pixels = []
-            if self.fill_mode == "ordered_edge":
-                pixels = self.model.ordered_edge_list_fill(self.debug_mode)
-            elif self.fill_mode == "active_edge":
-                pixels = self.model.active_edge_list_fill(self.debug_mode)
-            elif self.fill_mode == "simple_seed":
-                pixels = self.model.simple_seed_fill(self.seed_point, self.debug_mode)
-            elif self.fill_mode == "scanline_seed":
-                pixels = self.model.scanline_seed_fill(self.seed_point, self.debug_mode)
-            if self.debug_mode:
-                self.debug_data = pixels
+            if self.fill_mode == "coverage":
+                self.draw_coverage()
+            elif self.debug_mode:
+                # Steps are produced lazily; the trace keeps a bounded replay buffer.
+                # A replay must not see a mode or seed chosen after the trace was made.
+                mode, seed_point = self.fill_mode, self.seed_point
+                trace = DebugTrace(lambda: self.run_fill(True, mode, seed_point))
+                self.debug_data = trace if trace.has(0) else None
                 self.next_debug_step()
             else:
-                for point in pixels:
-                    self.canvas.create_rectangle(
-                        point.x, point.y, point.x + 1, point.y + 1,
-                        fill=self.COLORS['fill'], outline="", tags="fill"
-                    )
+                self.draw_fill(self.run_fill(False, self.fill_mode, self.seed_point))
                 if self.status_var:
                     self.status_var.set("Полигон заполнен")
         except ValueError as e:
@@ -0,0 +1,97 @@
+import json
+import re
+import numpy as np
+
+# Polygons are exchanged as lists of closed contours, (k, 2) float arrays
+# without the repeated closing point; the first contour is the outer one.
+# .npy files hold all contours in one (n, 2) array separated by NaN rows.
+
+_RING = re.compile(r"\(([^()]*)\)")
+
+
+def _open_ring(ring):
+    ring = np.asarray(ring, dtype=float).reshape(-1, 2)
+    if len(ring) > 1 and (ring[0] == ring[-1]).all():
+        ring = ring[:-1]
+    return ring
+
+
+def parse_wkt(text):
+    """Contours of a WKT POLYGON or MULTIPOLYGON."""
+    if not re.match(r"\s*(MULTI)?POLYGON\b", text, re.IGNORECASE):
+        raise ValueError("Ожидается WKT POLYGON или MULTIPOLYGON")
+    contours = []
+    for body in _RING.findall(text):
+        values = np.array(body.replace(",", " ").split(), dtype=float)
+        # Z and M values are dropped: count the coordinates of the first point.
+        dims = len(body.split(",", 1)[0].split())
+        contours.append(_open_ring(values.reshape(-1, dims)[:, :2]))
+    return contours
+
+
+def format_wkt(contours):
+    rings = []
+    for contour in contours:
+        closed = np.concatenate([contour, contour[:1]])
+        rings.append("(" + ", ".join(f"{x!r} {y!r}" for x, y in closed.tolist()) + ")")
+    return "POLYGON (" + ", ".join(rings) + ")"
+
+
+def parse_geojson(data):
+    """Contours of a GeoJSON Polygon, MultiPolygon, Feature or FeatureCollection."""
+    if not isinstance(data, dict):
+        raise ValueError("Ожидается объект GeoJSON")
+    kind = data.get("type")
+    if kind == "FeatureCollection":
+        return [c for feature in data["features"] for c in parse_geojson(feature)]
+    if kind == "Feature":
+        return parse_geojson(data["geometry"])
+    if kind == "Polygon":
+        return [_open_ring(np.asarray(ring, dtype=float)[:, :2]) for ring in data["coordinates"]]
+    if kind == "MultiPolygon":
+        return [_open_ring(np.asarray(ring, dtype=float)[:, :2]) for polygon in data["coordinates"] for ring in polygon]
+    raise ValueError(f"Неподдерживаемый тип GeoJSON: {kind}")
+
+
+def format_geojson(contours):
+    rings = [np.concatenate([c, c[:1]]).tolist() for c in contours]
+    return {"type": "Polygon", "coordinates": rings}
+
+
+def read_contours(path):
+    """Contours from a .geojson/.json, .wkt or .npy file."""
+    try:
+        if path.endswith(".npy"):
+            data = np.load(path).astype(float).reshape(-1, 2)
+            gaps = np.flatnonzero(np.isnan(data).any(axis=1))
+            contours = [_open_ring(part[~np.isnan(part).any(axis=1)]) for part in np.split(data, gaps)]
+        elif path.endswith((".geojson", ".json")):
+            with open(path, "r", encoding="utf-8") as file:
+                contours = parse_geojson(json.load(file))
+        elif path.endswith(".wkt"):
+            with open(path, "r", encoding="utf-8") as file:
+                contours = parse_wkt(file.read())
+        else:
+            raise ValueError("Поддерживаются файлы .geojson, .json, .wkt и .npy")
+    except (OSError, KeyError, TypeError, IndexError, json.JSONDecodeError) as e:
+        raise ValueError(f"Не удалось прочитать файл: {e}")
+    contours = [c for c in contours if len(c) >= 3]
+    if not contours:
+        raise ValueError("В файле нет полигонов")
+    return contours
+
+
+def write_contours(path, contours):
+    contours = [np.asarray(c, dtype=float).reshape(-1, 2) for c in contours]
+    if path.endswith(".npy"):
+        gap = np.full((1, 2), np.nan)
+        parts = [part for c in contours for part in (gap, c)][1:]
+        np.save(path, np.concatenate(parts) if parts else np.zeros((0, 2)))
+    elif path.endswith((".geojson", ".json")):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(format_geojson(contours), file)
+    elif path.endswith(".wkt"):
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(format_wkt(contours))
+    else:
+        raise ValueError("Поддерживаются файлы .geojson, .json, .wkt и .npy")
@@ -0,0 +1,79 @@
+import numpy as np
+
+
+def _split_intervals(points, starts, ends, tolerance, keep):
+    # All open intervals of one recursion level are processed together.
+    while len(starts):
+        count = ends - starts - 1
+        busy = count > 0
+        starts, ends, count = starts[busy], ends[busy], count[busy]
+        if not len(starts):
+            break
+        first = np.cumsum(count) - count
+        seg = np.repeat(np.arange(len(count)), count)
+        inner = starts[seg] + 1 + np.arange(len(seg)) - first[seg]
+        a, b, p = points[starts[seg]], points[ends[seg]], points[inner]
+        chord = b - a
+        length = np.hypot(chord[:, 0], chord[:, 1])
+        cross = np.abs(chord[:, 0] * (p[:, 1] - a[:, 1]) - chord[:, 1] * (p[:, 0] - a[:, 0]))
+        point_dist = np.hypot(p[:, 0] - a[:, 0], p[:, 1] - a[:, 1])
+        dist = np.where(length > 0, cross / np.where(length > 0, length, 1), point_dist)
+        far_dist = np.maximum.reduceat(dist, first)
+        far = np.minimum.reduceat(np.where(dist == far_dist[seg], inner, len(points)), first)
+        split = far_dist > tolerance
+        keep[far[split]] = True
+        starts, ends = np.concatenate([starts[split], far[split]]), np.concatenate([far[split], ends[split]])
+    return keep
+
+
+def douglas_peucker(points, tolerance, closed=True):
+    """Indices of the vertices kept by Douglas-Peucker with a distance tolerance.
+
+    The recursion runs breadth first: every pass finds the farthest vertex
+    of all pending intervals at once. A closed ring is cut at its first
+    vertex and the vertex farthest from it.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    n = len(points)
+    if n < 3:
+        return np.arange(n)
+    if not closed:
+        keep = np.zeros(n, dtype=bool)
+        keep[[0, n - 1]] = True
+        return np.flatnonzero(_split_intervals(points, np.array([0]), np.array([n - 1]), tolerance, keep))
+    ring = np.concatenate([points, points[:1]])
+    opposite = int(np.argmax(np.hypot(points[:, 0] - points[0, 0], points[:, 1] - points[0, 1])))
+    keep = np.zeros(n + 1, dtype=bool)
+    keep[[0, opposite]] = True
+    keep = _split_intervals(ring, np.array([0, opposite]), np.array([opposite, n]), tolerance, keep)
+    return np.flatnonzero(keep[:n])
+
+
+def visvalingam(points, min_area, closed=True):
+    """Indices of the vertices kept by Visvalingam-Whyatt elimination.
+
+    Vertices whose triangle with their neighbours has an area below
+    min_area are removed. Instead of one vertex per heap step, every pass
+    removes all vertices that are strict local minima of the area, which
+    are never adjacent, and then recomputes the areas of the survivors.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    alive = np.arange(len(points))
+    least = 3 if closed else 2
+    while len(alive) > least:
+        p = points[alive]
+        prev, nxt = np.roll(p, 1, axis=0), np.roll(p, -1, axis=0)
+        area = np.abs((p[:, 0] - prev[:, 0]) * (nxt[:, 1] - prev[:, 1])
+                      - (p[:, 1] - prev[:, 1]) * (nxt[:, 0] - prev[:, 0])) / 2
+        if not closed:
+            area[[0, -1]] = np.inf
+        # Ties are broken by position so that neighbours never both qualify.
+        rank = np.empty(len(area), dtype=np.int64)
+        rank[np.lexsort((np.arange(len(area)), area))] = np.arange(len(area))
+        drop = (area < min_area) & (rank < np.roll(rank, 1)) & (rank < np.roll(rank, -1))
+        if not drop.any():
+            break
+        if len(alive) - drop.sum() < least:
+            drop[np.flatnonzero(drop)[len(alive) - least:]] = False
+        alive = alive[~drop]
+    return alive
@@ -0,0 +1,68 @@
+import numpy as np
+from raster_fill import polygon_edges
+
+
+class PreparedPolygon:
+    """Point-in-polygon index for batches of query points.
+
+    Edges are bucketed into horizontal slabs of equal height; a query only
+    tests the edges of its slab, with the same crossing rule as
+    PolygonModel.is_inside.
+    """
+
+    CHUNK = 1 << 22
+
+    def __init__(self, xs, ys):
+        self._build(*polygon_edges(xs, ys))
+
+    @classmethod
+    def from_contours(cls, contours):
+        """Index of several closed (k, 2) contours under the even-odd rule."""
+        edges = [polygon_edges(c[:, 0], c[:, 1]) for c in (np.asarray(c, dtype=float).reshape(-1, 2) for c in contours)]
+        prepared = cls.__new__(cls)
+        prepared._build(*(np.concatenate([e[k] for e in edges]) if edges else np.zeros(0) for k in range(4)))
+        return prepared
+
+    def _build(self, x1, y1, x2, y2):
+        keep = y1 != y2
+        self.x1, self.y1, self.x2, self.y2 = x1[keep], y1[keep], x2[keep], y2[keep]
+        self.low, self.high = np.minimum(self.y1, self.y2), np.maximum(self.y1, self.y2)
+        self.dx, self.dy = self.x2 - self.x1, self.y2 - self.y1
+        n = len(self.low)
+        self.y_min = float(self.low.min()) if n else 0.0
+        extent = float(self.high.max()) - self.y_min if n else 0.0
+        total = float(np.sum(self.high - self.low))
+        # Enough slabs to keep about four slab entries per edge in total.
+        self.slab_count = int(np.clip(4 * n * extent / total, 1, max(n, 1))) if total > 0 else 1
+        self.slab_height = extent / self.slab_count if extent > 0 else 1.0
+        first, last = self._slab_of(self.low), self._slab_of(self.high)
+        counts = last - first + 1
+        edge = np.repeat(np.arange(n), counts)
+        slab = first[edge] + np.arange(len(edge)) - np.repeat(np.cumsum(counts) - counts, counts)
+        order = np.argsort(slab, kind='stable')
+        self.slab_edges = edge[order]
+        self.slab_offsets = np.searchsorted(slab[order], np.arange(self.slab_count + 1))
+
+    def _slab_of(self, ys):
+        return np.clip(((ys - self.y_min) / self.slab_height).astype(np.int64), 0, self.slab_count - 1)
+
+    def contains(self, points):
+        """Bool array: is each row of an (N, 2) array inside the polygon."""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        result = np.zeros(len(points), dtype=bool)
+        slabs = self._slab_of(points[:, 1])
+        counts = self.slab_offsets[slabs + 1] - self.slab_offsets[slabs]
+        # Chunks hold about CHUNK (query, edge) pairs rather than a fixed number of queries.
+        bounds = np.searchsorted(np.cumsum(counts), np.arange(self.CHUNK, counts.sum() + self.CHUNK, self.CHUNK))
+        bounds = np.unique(np.concatenate([[0], np.minimum(bounds + 1, len(points)), [len(points)]]))
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            qx, qy = points[start:stop, 0], points[start:stop, 1]
+            slab, count = slabs[start:stop], counts[start:stop]
+            query = np.repeat(np.arange(len(qx)), count)
+            base = np.repeat(self.slab_offsets[slab] - (np.cumsum(count) - count), count)
+            edge = self.slab_edges[base + np.arange(len(query))]
+            y = qy[query]
+            hit = (self.low[edge] < y) & (y <= self.high[edge])
+            hit &= self.x1[edge] + (y - self.y1[edge]) * self.dx[edge] / self.dy[edge] > qx[query]
+            result[start:stop] = np.bincount(query[hit], minlength=len(qx)) % 2 == 1
+        return result
@@ -0,0 +1,253 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+# Scanline conventions shared by the polygon fills: an edge covers the
+# integer scanlines low_y <= y < high_y, and a pixel x lies in a span when
+# x_left <= x < x_right, i.e. x from ceil(x_left) to ceil(x_right) - 1.
+
+
+def polygon_edges(xs, ys):
+    """(x1, y1, x2, y2) arrays of the closed polygon with the given vertices."""
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    return xs, ys, np.roll(xs, -1), np.roll(ys, -1)
+
+
+def scanline_crossings(x1, y1, x2, y2, y_min=None, y_max=None, with_edges=False):
+    """All edge/scanline crossings in one pass.
+
+    Returns (rows, xs, winding) with one entry per crossing; winding is +1 for
+    edges going down (increasing y) and -1 for edges going up. Only rows in
+    [y_min, y_max) are produced when the limits are given. with_edges adds
+    the index of the edge of every crossing as a fourth array.
+    """
+    x1, y1, x2, y2 = (np.asarray(a, dtype=float) for a in (x1, y1, x2, y2))
+    keep = y1 != y2
+    x1, y1, x2, y2 = x1[keep], y1[keep], x2[keep], y2[keep]
+    down = y2 > y1
+    low_x, low_y = np.where(down, x1, x2), np.where(down, y1, y2)
+    high_x, high_y = np.where(down, x2, x1), np.where(down, y2, y1)
+    slope = (high_x - low_x) / (high_y - low_y)
+    first = np.ceil(low_y).astype(np.int64)
+    last = np.ceil(high_y).astype(np.int64)
+    if y_min is not None:
+        first = np.maximum(first, y_min)
+    if y_max is not None:
+        last = np.minimum(last, y_max)
+    count = np.maximum(last - first, 0)
+    edge = np.repeat(np.arange(len(count)), count)
+    rows = first[edge] + np.arange(len(edge)) - np.repeat(np.cumsum(count) - count, count)
+    xs = low_x[edge] + (rows - low_y[edge]) * slope[edge]
+    winding = np.where(down[edge], 1, -1)
+    if with_edges:
+        return rows, xs, winding, np.flatnonzero(keep)[edge]
+    return rows, xs, winding
+
+
+def fill_mask(x1, y1, x2, y2, x0, y0, width, height, rule="evenodd"):
+    """uint8 mask (height, width) of the polygon; pixel (i, j) is (x0 + j, y0 + i).
+
+    Every crossing adds its weight at column ceil(x); a cumulative sum along
+    each row then gives the crossing parity (even-odd) or winding number
+    (nonzero) of every pixel.
+    """
+    if rule not in ("evenodd", "nonzero"):
+        raise ValueError(f"Неизвестное правило заполнения: {rule}")
+    rows, xs, winding = scanline_crossings(x1, y1, x2, y2, y0, y0 + height)
+    cols = np.clip(np.ceil(xs - x0), 0, width).astype(np.int64)
+    weights = np.ones(len(rows)) if rule == "evenodd" else winding
+    acc = np.bincount((rows - y0) * (width + 1) + cols, weights, height * (width + 1))
+    acc = np.cumsum(acc.reshape(height, width + 1)[:, :width], axis=1)
+    if rule == "evenodd":
+        return (acc.astype(np.int64) & 1).astype(np.uint8)
+    return (acc != 0).astype(np.uint8)
+
+
+def _fill_band(edges, x0, y0, width, frame, start, stop, rule):
+    x1, y1, x2, y2 = edges
+    # Only edges reaching into the band produce crossings there.
+    keep = (np.maximum(y1, y2) > y0 + start) & (np.minimum(y1, y2) < y0 + stop)
+    frame[start:stop] = fill_mask(x1[keep], y1[keep], x2[keep], y2[keep], x0, y0 + start, width, stop - start, rule)
+
+
+def _band_task(edges_name, edge_count, frame_name, x0, y0, width, height, start, stop, rule):
+    edges_block = shared_memory.SharedMemory(name=edges_name)
+    frame_block = shared_memory.SharedMemory(name=frame_name)
+    try:
+        edges = np.ndarray((4, edge_count), dtype=float, buffer=edges_block.buf)
+        frame = np.ndarray((height, width), dtype=np.uint8, buffer=frame_block.buf)
+        _fill_band(edges, x0, y0, width, frame, start, stop, rule)
+    finally:
+        edges_block.close()
+        frame_block.close()
+
+
+def tiled_fill_mask(x1, y1, x2, y2, x0, y0, width, height, rule="evenodd", workers=None, bands=None):
+    """fill_mask computed in horizontal bands by a process pool.
+
+    The edges and the uint8 framebuffer live in shared memory; every worker
+    fills its rows in place, so nothing but the band bounds is pickled.
+    Small images and a single worker run the bands in this process.
+    """
+    if rule not in ("evenodd", "nonzero"):
+        raise ValueError(f"Неизвестное правило заполнения: {rule}")
+    edges = np.ascontiguousarray(np.stack([np.asarray(a, dtype=float) for a in (x1, y1, x2, y2)]))
+    workers = workers or os.cpu_count() or 1
+    bands = max(1, min(bands or 4 * workers, height))
+    bounds = np.linspace(0, height, bands + 1).astype(np.int64).tolist()
+    if workers == 1 or width * height < 1 << 20:
+        frame = np.zeros((height, width), dtype=np.uint8)
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            _fill_band(edges, x0, y0, width, frame, start, stop, rule)
+        return frame
+    edges_block = shared_memory.SharedMemory(create=True, size=max(edges.nbytes, 1))
+    frame_block = shared_memory.SharedMemory(create=True, size=width * height)
+    try:
+        np.ndarray(edges.shape, dtype=float, buffer=edges_block.buf)[:] = edges
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_band_task, [edges_block.name] * bands, [edges.shape[1]] * bands,
+                          [frame_block.name] * bands, [x0] * bands, [y0] * bands, [width] * bands,
+                          [height] * bands, bounds[:-1], bounds[1:], [rule] * bands))
+        return np.ndarray((height, width), dtype=np.uint8, buffer=frame_block.buf).copy()
+    finally:
+        edges_block.close()
+        edges_block.unlink()
+        frame_block.close()
+        frame_block.unlink()
+
+
+def coverage_mask(x1, y1, x2, y2, x0, y0, width, height, rule="evenodd"):
+    """float32 (height, width) fraction of every pixel covered by the polygon.
+
+    Pixel (i, j) is the unit square centred on (x0 + j, y0 + i). Edges are
+    cut at every cell border and each piece adds its signed height to its
+    cell, split by how much of the cell lies to the right of it, as in font
+    rasterizers; a cumulative sum along the rows then gives the signed
+    coverage, folded per rule.
+    """
+    if rule not in ("evenodd", "nonzero"):
+        raise ValueError(f"Неизвестное правило заполнения: {rule}")
+    # Cell coordinates: pixel (i, j) is [j, j + 1) x [i, i + 1).
+    ax = np.asarray(x1, dtype=float) - x0 + 0.5
+    ay = np.asarray(y1, dtype=float) - y0 + 0.5
+    bx = np.asarray(x2, dtype=float) - x0 + 0.5
+    by = np.asarray(y2, dtype=float) - y0 + 0.5
+    keep = ay != by
+    ax, ay, bx, by = ax[keep], ay[keep], bx[keep], by[keep]
+    # Parameters t where every edge crosses a vertical or horizontal cell border.
+    cuts = [np.zeros(len(ax)), np.ones(len(ax))]
+    owners = [np.arange(len(ax)), np.arange(len(ax))]
+    for a, b in ((ax, bx), (ay, by)):
+        lo, hi = np.minimum(a, b), np.maximum(a, b)
+        first = np.floor(lo).astype(np.int64) + 1
+        count = np.maximum(np.ceil(hi).astype(np.int64) - first, 0)
+        edge = np.repeat(np.arange(len(count)), count)
+        border = first[edge] + np.arange(len(edge)) - np.repeat(np.cumsum(count) - count, count)
+        cuts.append((border - a[edge]) / (b[edge] - a[edge]))
+        owners.append(edge)
+    t, edge = np.concatenate(cuts), np.concatenate(owners)
+    order = np.lexsort((t, edge))
+    t, edge = t[order], edge[order]
+    piece = np.flatnonzero((edge[1:] == edge[:-1]) & (t[1:] > t[:-1]))
+    e, ta, tb = edge[piece], t[piece], t[piece + 1]
+    dx, dy = bx[e] - ax[e], by[e] - ay[e]
+    xa, xb = ax[e] + ta * dx, ax[e] + tb * dx
+    height_part = (tb - ta) * dy
+    mid_x = (xa + xb) / 2
+    mid_y = ay[e] + (ta + tb) / 2 * dy
+    col = np.floor(mid_x).astype(np.int64)
+    row = np.floor(mid_y).astype(np.int64)
+    inside = (row >= 0) & (row < height) & (col < width)
+    col, row, height_part, mid_x = col[inside], row[inside], height_part[inside], mid_x[inside]
+    # Pieces left of the image cover whole rows from column 0.
+    frac = np.where(col < 0, 1.0, mid_x - col)
+    col = np.maximum(col, 0)
+    index = row * (width + 1) + col
+    acc = np.bincount(index, height_part * (1 - frac), height * (width + 1))
+    acc += np.bincount(index + 1, height_part * frac, height * (width + 1))
+    acc = acc.astype(np.float32).reshape(height, width + 1)[:, :width]
+    cover = np.abs(np.cumsum(acc, axis=1, dtype=np.float32))
+    if rule == "evenodd":
+        cover = np.mod(cover, 2, dtype=np.float32)
+        cover = np.where(cover > 1, 2 - cover, cover)
+    return np.minimum(cover, 1, dtype=np.float32)
+
+
+def batch_fill(xs, ys, offsets, colors, width, height, rule="evenodd", image=None):
+    """Fill many polygons into one (height, width, 4) uint8 RGBA image.
+
+    Polygon k has the vertices offsets[k] <= i < offsets[k + 1] of the flat
+    xs, ys arrays and the RGBA (or RGB, then opaque) color colors[k]. All
+    edges go into one global edge table, so the work is a handful of array
+    passes whatever the number of polygons. Later polygons are drawn over
+    earlier ones; pixels no polygon covers keep the content of image, which
+    is filled in place and so must be a C-contiguous uint8 array.
+    """
+    if rule not in ("evenodd", "nonzero"):
+        raise ValueError(f"Неизвестное правило заполнения: {rule}")
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    colors = np.asarray(colors, dtype=np.uint8)
+    if colors.ndim == 2 and colors.shape[1] == 3:
+        colors = np.concatenate([colors, np.full((len(colors), 1), 255, dtype=np.uint8)], axis=1)
+    if image is None:
+        image = np.zeros((height, width, 4), dtype=np.uint8)
+    elif not (isinstance(image, np.ndarray) and image.dtype == np.uint8
+              and image.shape == (height, width, 4) and image.flags.c_contiguous):
+        raise ValueError(f"Изображение должно быть непрерывным массивом uint8 формы ({height}, {width}, 4)")
+    if len(xs) == 0:
+        return image
+    sizes = np.diff(offsets)
+    polygon = np.repeat(np.arange(len(sizes)), sizes)
+    # The edge from every vertex to the next one of its own polygon.
+    following = np.arange(len(xs)) + 1
+    following[offsets[1:][sizes > 0] - 1] = offsets[:-1][sizes > 0]
+    rows, cx, winding, edge = scanline_crossings(xs, ys, xs[following], ys[following], 0, height, with_edges=True)
+    owner = polygon[edge]
+    order = np.lexsort((cx, rows, owner))
+    rows, cx, winding, owner = rows[order], cx[order], winding[order], owner[order]
+    # Every polygon crosses a row an even number of times with zero total
+    # winding, so running counts over the whole sorted list restart at each
+    # (polygon, row) group by themselves.
+    if rule == "evenodd":
+        inside = np.arange(len(rows)) % 2 == 0
+    else:
+        inside = np.cumsum(winding) != 0
+    inside[-1:] = False
+    k = np.flatnonzero(inside)
+    starts = np.clip(np.ceil(cx[k]), 0, width).astype(np.int64)
+    ends = np.clip(np.ceil(cx[k + 1]), 0, width).astype(np.int64)
+    count = np.maximum(ends - starts, 0)
+    pixel = np.repeat(rows[k] * width + starts - (np.cumsum(count) - count), count) + np.arange(count.sum())
+    top = np.full(width * height, -1, dtype=np.int64)
+    np.maximum.at(top, pixel, np.repeat(owner[k], count))
+    covered = np.flatnonzero(top >= 0)
+    image.reshape(-1, 4)[covered] = colors[top[covered]]
+    return image
+
+
+def mask_to_spans(mask, x0=0, y0=0):
+    """(rows, x_starts, x_ends) arrays of the filled runs of a mask, ends inclusive."""
+    padded = np.zeros((mask.shape[0], mask.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask != 0
+    change = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(change == 1)
+    _, ends = np.nonzero(change == -1)
+    return rows + y0, starts + x0, ends - 1 + x0
+
+
+def boundary_mask(x1, y1, x2, y2, x0, y0, width, height):
+    """Bool mask of the pixels on the polygon outline (8-connected DDA per edge)."""
+    x1, y1, x2, y2 = (np.asarray(a, dtype=float) for a in (x1, y1, x2, y2))
+    steps = np.ceil(np.maximum(np.abs(x2 - x1), np.abs(y2 - y1))).astype(np.int64) + 1
+    edge = np.repeat(np.arange(len(steps)), steps)
+    t = (np.arange(len(edge)) - np.repeat(np.cumsum(steps) - steps, steps)) / np.maximum(steps[edge] - 1, 1)
+    px = np.floor(x1[edge] + (x2[edge] - x1[edge]) * t + 0.5).astype(np.int64) - x0
+    py = np.floor(y1[edge] + (y2[edge] - y1[edge]) * t + 0.5).astype(np.int64) - y0
+    keep = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+    mask = np.zeros((height, width), dtype=bool)
+    mask[py[keep], px[keep]] = True
+    return mask
@@ -0,0 +1,16 @@
+import tkinter as tk
+import numpy as np
+
+
+def photo_from_rgb(rgb, master=None):
+    """Wrap an (H, W, 3) uint8 array in a Tk PhotoImage with a single PPM upload."""
+    rgb = np.ascontiguousarray(rgb, dtype=np.uint8)
+    height, width = rgb.shape[:2]
+    header = f"P6 {width} {height} 255 ".encode()
+    return tk.PhotoImage(master=master, width=width, height=height, data=header + rgb.tobytes(), format="PPM")
+
+
+def site_palette(count, seed=7):
+    """Stable light colors for count sites."""
+    rng = np.random.default_rng(seed)
+    return rng.integers(90, 256, size=(count, 3), dtype=np.uint8)
@@ -0,0 +1,211 @@
+import heapq
+from fractions import Fraction
+from functools import cmp_to_key
+
+# Bentley-Ottmann sweep over line segments. The sweep line is vertical and
+# moves left to right; event points are ordered by (x, y) and the status
+# list keeps the segments crossing the sweep line from bottom to top.
+# Intersection points are kept as exact fractions so that events created by
+# crossings compare and match reliably with the input endpoints.
+
+
+def _key(point):
+    # Floats round monotonically, so comparing them first orders exact
+    # points correctly and is much cheaper than comparing fractions.
+    x, y = point
+    return float(x), x, float(y), y
+
+
+def _orient(ax, ay, bx, by, cx, cy):
+    value = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    return (value > 0) - (value < 0)
+
+
+class _Sweep:
+    def __init__(self, x1, y1, x2, y2, following):
+        self.lx, self.ly, self.rx, self.ry = [], [], [], []
+        for a, b, c, d in zip(x1, y1, x2, y2):
+            a, b, c, d = float(a), float(b), float(c), float(d)
+            if (c, d) < (a, b):
+                a, b, c, d = c, d, a, b
+            self.lx.append(a)
+            self.ly.append(b)
+            self.rx.append(c)
+            self.ry.append(d)
+        self.following = following
+        # Exact copies of the coordinates as integers over a common power of
+        # two denominator, used for crossing points.
+        ratios = [v.as_integer_ratio() for v in self.lx + self.ly + self.rx + self.ry]
+        self.scale = max((d for _, d in ratios), default=1)
+        n = len(self.lx)
+        exact = [num * (self.scale // d) for num, d in ratios]
+        self.exact = list(zip(exact[:n], exact[n:2 * n], exact[2 * n:3 * n], exact[3 * n:]))
+        self.status = []
+
+    def adjacent(self, a, b):
+        if self.following is None:
+            return False
+        return self.following[a] == b or self.following[b] == a
+
+    def orient(self, s, px, py):
+        """Sign of the turn from segment s to the point, exact near zero."""
+        lx, ly, rx, ry = self.lx[s], self.ly[s], self.rx[s], self.ry[s]
+        fx, fy = float(px), float(py)
+        value = (rx - lx) * (fy - ly) - (ry - ly) * (fx - lx)
+        if abs(value) > 1e-9 * (abs(rx - lx) + abs(ry - ly)) * (abs(fx) + abs(fy) + abs(lx) + abs(ly) + 1):
+            return 1 if value > 0 else -1
+        lx, ly, rx, ry = self.exact[s]
+        if isinstance(px, Fraction):
+            px, py = px * self.scale, py * self.scale
+        else:
+            px, py = (num * (self.scale // d) for num, d in (px.as_integer_ratio(), py.as_integer_ratio()))
+        return _orient(lx, ly, rx, ry, px, py)
+
+    def side(self, s, px, py, known=()):
+        """+1 if the point is above segment s, -1 if below, 0 if on it.
+
+        known holds segments already found to pass through a crossing point.
+        """
+        if self.lx[s] == self.rx[s]:
+            return 1 if py > self.ry[s] else (-1 if py < self.ly[s] else 0)
+        if s in known:
+            return 0
+        return self.orient(s, px, py)
+
+    def _direction_order(self, a, b):
+        # Sign of the turn from a to b: positive when b is steeper.
+        ax, ay = self.rx[a] - self.lx[a], self.ry[a] - self.ly[a]
+        bx, by = self.rx[b] - self.lx[b], self.ry[b] - self.ly[b]
+        value = ax * by - ay * bx
+        if abs(value) <= 1e-9 * (abs(ax) + abs(ay)) * (abs(bx) + abs(by)):
+            alx, aly, arx, ary = self.exact[a]
+            blx, bly, brx, bry = self.exact[b]
+            value = (arx - alx) * (bry - bly) - (ary - aly) * (brx - blx)
+        return (value > 0) - (value < 0)
+
+    def _block(self, px, py, known):
+        status = self.status
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.side(status[mid], px, py, known) > 0:
+                lo = mid + 1
+            else:
+                hi = mid
+        end = lo
+        while end < len(status) and self.side(status[end], px, py, known) == 0:
+            end += 1
+        return lo, end
+
+    def may_intersect(self, a, b):
+        lx, ly, rx, ry = self.lx, self.ly, self.rx, self.ry
+        o1 = self.orient(a, lx[b], ly[b])
+        o2 = self.orient(a, rx[b], ry[b])
+        o3 = self.orient(b, lx[a], ly[a])
+        o4 = self.orient(b, rx[a], ry[a])
+        if o1 * o2 > 0 or o3 * o4 > 0:
+            return False
+        if o1 == o2 == 0:
+            # Collinear: the lexicographic ranges have to overlap.
+            return max((lx[a], ly[a]), (lx[b], ly[b])) <= min((rx[a], ry[a]), (rx[b], ry[b]))
+        return True
+
+    def intersection_point(self, a, b):
+        """First common point of two intersecting segments, exact."""
+        alx, aly, arx, ary = self.exact[a]
+        blx, bly, brx, bry = self.exact[b]
+        dax, day = arx - alx, ary - aly
+        dbx, dby = brx - blx, bry - bly
+        denom = dax * dby - day * dbx
+        if denom == 0:
+            return max((self.lx[a], self.ly[a]), (self.lx[b], self.ly[b]))
+        num = (blx - alx) * dby - (bly - aly) * dbx
+        if denom < 0:
+            num, denom = -num, -denom
+        return (Fraction(alx * denom + num * dax, denom * self.scale),
+                Fraction(aly * denom + num * day, denom * self.scale))
+
+    def overlapping(self, a, b):
+        """Do two segments with a common endpoint fold back onto each other."""
+        if self._direction_order(a, b) != 0:
+            return False
+        return ((self.lx[a], self.ly[a]) == (self.lx[b], self.ly[b])
+                or (self.rx[a], self.ry[a]) == (self.rx[b], self.ry[b]))
+
+    def run(self, first_only):
+        events = {}
+        for s in range(len(self.lx)):
+            events.setdefault((self.lx[s], self.ly[s]), []).append(s)
+            events.setdefault((self.rx[s], self.ry[s]), [])
+        queue = [_key(point) for point in events]
+        heapq.heapify(queue)
+        crossings = {}
+        found = {}
+
+        def check(a, b, px, py):
+            if self.adjacent(a, b) or not self.may_intersect(a, b):
+                return False
+            if first_only:
+                found[(a, b)] = self.intersection_point(a, b)
+                return True
+            point = self.intersection_point(a, b)
+            key = _key(point)
+            if key > current:
+                if point not in events:
+                    events[point] = []
+                    heapq.heappush(queue, key)
+                crossings.setdefault(point, set()).update((a, b))
+            return False
+
+        while queue:
+            current = heapq.heappop(queue)
+            px, py = point = current[1], current[3]
+            upper = events.pop(point)
+            lo, hi = self._block(px, py, crossings.pop(point, ()))
+            block = self.status[lo:hi]
+            if isinstance(px, Fraction):
+                # Crossings that hit an endpoint share the endpoint's event.
+                lower, through = [], block
+            else:
+                lower = [s for s in block if (self.rx[s], self.ry[s]) == point]
+                through = [s for s in block if (self.rx[s], self.ry[s]) != point]
+            # Zero-length segments start and end here; they never enter the status.
+            lower += [s for s in upper if (self.rx[s], self.ry[s]) == point]
+            upper = [s for s in upper if (self.rx[s], self.ry[s]) != point]
+            touching = lower + upper + through
+            if len(touching) > 1:
+                ends = set(lower + upper)
+                for i, a in enumerate(touching):
+                    for b in touching[i + 1:]:
+                        if self.adjacent(a, b) and a in ends and b in ends and not self.overlapping(a, b):
+                            continue
+                        found.setdefault((min(a, b), max(a, b)), point)
+                        if first_only:
+                            return found
+            inserted = sorted(upper + through, key=cmp_to_key(lambda a, b: -self._direction_order(a, b)))
+            self.status[lo:hi] = inserted
+            below = lo - 1
+            above = lo + len(inserted)
+            if not inserted:
+                if below >= 0 and above < len(self.status) and check(self.status[below], self.status[above], px, py):
+                    return found
+                continue
+            if below >= 0 and check(self.status[below], inserted[0], px, py):
+                return found
+            if above < len(self.status) and check(inserted[-1], self.status[above], px, py):
+                return found
+        return found
+
+
+def segment_intersections(x1, y1, x2, y2, following=None, first_only=False):
+    """Intersecting pairs of the segments (x1, y1) - (x2, y2).
+
+    Returns a list of (i, j, x, y) with i < j and (x, y) the leftmost common
+    point of the pair. following[i] is the segment that continues segment i
+    in a ring (or -1); such neighbours are not reported when they only share
+    their common vertex. With first_only the sweep stops at the first
+    intersection it meets.
+    """
+    sweep = _Sweep(x1, y1, x2, y2, following)
+    found = sweep.run(first_only)
+    return sorted((min(a, b), max(a, b), float(x), float(y)) for (a, b), (x, y) in found.items())
@@ -0,0 +1,138 @@
+from math import ceil, floor, hypot, inf
+
+
+class SpatialGrid:
+    """Uniform hash grid over points and segments for hit-testing.
+
+    A segment is stored in the cells along it rather than in every cell of
+    its bounding box, so long edges stay cheap; an insertion costs
+    O(cells crossed) and queries only look at the cells around the query
+    point. Keys are arbitrary hashable values.
+    """
+
+    def __init__(self, cell=8.0):
+        self.cell = float(cell)
+        self.cells = {}
+        self.items = {}
+        # Cell range ever occupied; it bounds how far a ring search goes.
+        self.bounds = None
+
+    def __len__(self):
+        return len(self.items)
+
+    def _range(self, x_min, y_min, x_max, y_max):
+        c = self.cell
+        return floor(x_min / c), floor(y_min / c), floor(x_max / c), floor(y_max / c)
+
+    def _covered(self, x1, y1, x2, y2):
+        # Pieces no longer than a cell: the boxes of the pieces cover every
+        # cell the segment passes through.
+        steps = max(1, ceil(max(abs(x2 - x1), abs(y2 - y1)) / self.cell))
+        cells = set()
+        for s in range(steps):
+            ax, ay = x1 + (x2 - x1) * s / steps, y1 + (y2 - y1) * s / steps
+            bx, by = x1 + (x2 - x1) * (s + 1) / steps, y1 + (y2 - y1) * (s + 1) / steps
+            i0, j0, i1, j1 = self._range(min(ax, bx), min(ay, by), max(ax, bx), max(ay, by))
+            cells.update((i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1))
+        return cells
+
+    def insert(self, key, x1, y1, x2=None, y2=None):
+        """Add a point (x1, y1) or a segment; a key already present is moved."""
+        if key in self.items:
+            self.remove(key)
+        x2 = x1 if x2 is None else x2
+        y2 = y1 if y2 is None else y2
+        self.items[key] = (x1, y1, x2, y2)
+        i0, j0, i1, j1 = self._range(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        if self.bounds is None:
+            self.bounds = (i0, j0, i1, j1)
+        else:
+            b = self.bounds
+            self.bounds = (min(b[0], i0), min(b[1], j0), max(b[2], i1), max(b[3], j1))
+        if i0 == i1 and j0 == j1:
+            self.cells.setdefault((i0, j0), []).append(key)
+            return
+        for cell in self._covered(x1, y1, x2, y2):
+            self.cells.setdefault(cell, []).append(key)
+
+    def remove(self, key):
+        x1, y1, x2, y2 = self.items.pop(key)
+        i0, j0, i1, j1 = self._range(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        cells = [(i0, j0)] if i0 == i1 and j0 == j1 else self._covered(x1, y1, x2, y2)
+        for cell in cells:
+            bucket = self.cells[cell]
+            bucket.remove(key)
+            if not bucket:
+                del self.cells[cell]
+
+    def clear(self):
+        self.cells.clear()
+        self.items.clear()
+        self.bounds = None
+
+    def distance(self, key, x, y):
+        """Distance from (x, y) to the point or segment of key."""
+        x1, y1, x2, y2 = self.items[key]
+        dx, dy = x2 - x1, y2 - y1
+        length = dx * dx + dy * dy
+        t = 0.0 if length == 0 else min(1.0, max(0.0, ((x - x1) * dx + (y - y1) * dy) / length))
+        return hypot(x1 + t * dx - x, y1 + t * dy - y)
+
+    def within(self, x, y, radius):
+        """(distance, key) of the items within radius, nearest first."""
+        i0, j0, i1, j1 = self._range(x - radius, y - radius, x + radius, y + radius)
+        seen = set()
+        found = []
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                for key in self.cells.get((i, j), ()):
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    d = self.distance(key, x, y)
+                    if d <= radius:
+                        found.append((d, key))
+        found.sort(key=lambda item: item[0])
+        return found
+
+    def nearest(self, x, y, k=1, radius=inf):
+        """Up to k (distance, key) pairs nearest to (x, y) within radius.
+
+        Rings of cells are scanned outwards from the query's cell; after
+        ring r every unseen item is at least r cells away, which bounds
+        the search.
+        """
+        if not self.items:
+            return []
+        ci, cj = floor(x / self.cell), floor(y / self.cell)
+        i0, j0, i1, j1 = self.bounds
+        limit = max(abs(ci - i0), abs(ci - i1), abs(cj - j0), abs(cj - j1))
+        seen = set()
+        found = []
+        r = 0
+        while True:
+            for i, j in self._ring(ci, cj, r):
+                for key in self.cells.get((i, j), ()):
+                    if key not in seen:
+                        seen.add(key)
+                        d = self.distance(key, x, y)
+                        if d <= radius:
+                            found.append((d, key))
+            found.sort(key=lambda item: item[0])
+            del found[k:]
+            reach = r * self.cell
+            if r >= limit or reach > radius or (len(found) == k and found[-1][0] <= reach):
+                return found
+            r += 1
+
+    @staticmethod
+    def _ring(ci, cj, r):
+        if r == 0:
+            yield ci, cj
+            return
+        for i in range(ci - r, ci + r + 1):
+            yield i, cj - r
+            yield i, cj + r
+        for j in range(cj - r + 1, cj + r):
+            yield ci - r, j
+            yield ci + r, j
@@ -0,0 +1,50 @@
+import numpy as np
+
+from NearestSite import NearestSiteIndex
+from Voronoi import VoronoiDiagram
+
+
+def _sites_with_repeats(rng, count=30, repeats=3):
+    points = [tuple(map(int, p)) for p in rng.integers(0, 800, (count, 2))]
+    points += [points[i] for i in rng.integers(0, count, repeats)]
+    order = rng.permutation(len(points))
+    return [points[i] for i in order]
+
+
+def _index(points):
+    diagram = VoronoiDiagram(points)
+    diagram.construct()
+    return NearestSiteIndex.from_voronoi(diagram)
+
+
+def test_query_matches_brute_force_with_duplicates():
+    rng = np.random.default_rng(28)
+    for _ in range(20):
+        points = _sites_with_repeats(rng)
+        index = _index(points)
+        queries = rng.uniform(-100, 900, (2000, 2))
+        sites = np.array(points, dtype=float)
+        dist = ((queries[:, None, :] - sites[None, :, :]) ** 2).sum(axis=2)
+        found = index.query(queries)
+        assert np.array_equal(dist[np.arange(len(queries)), found], dist.min(axis=1))
+
+
+def test_duplicates_resolve_to_first_occurrence():
+    points = [(10, 10), (200, 50), (10, 10), (90, 300), (200, 50)]
+    index = _index(points)
+    found = index.query(np.array(points, dtype=float))
+    assert found.tolist() == [0, 1, 0, 3, 1]
+
+
+def test_rasterize_matches_brute_force_owners():
+    rng = np.random.default_rng(29)
+    width, height = 800, 600
+    gy, gx = np.mgrid[0:height, 0:width]
+    for block in (None, 2, 8):
+        points = _sites_with_repeats(rng)
+        owners = _index(points).rasterize(width, height, block=block)
+        assert owners.shape == (height, width)
+        sites = np.array(points, dtype=float)
+        dist = (gx[..., None] - sites[:, 0]) ** 2 + (gy[..., None] - sites[:, 1]) ** 2
+        chosen = np.take_along_axis(dist, owners[..., None], axis=2)[..., 0]
+        assert np.array_equal(chosen, dist.min(axis=2))
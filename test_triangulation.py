@@ -0,0 +1,33 @@
+import numpy as np
+
+from polygon_filler import PolygonModel
+
+
+def _triangulate(contour):
+    model = PolygonModel()
+    model.set_contour(contour)
+    return model.triangulate()
+
+
+def _check(contour, triangles):
+    x, y = contour[:, 0], contour[:, 1]
+    assert len(triangles) == len(contour) - 2
+    a, b, c = contour[triangles[:, 0]], contour[triangles[:, 1]], contour[triangles[:, 2]]
+    areas = np.abs((b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])) / 2
+    polygon_area = abs(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)) / 2
+    assert np.isclose(areas.sum(), polygon_area, rtol=1e-9)
+
+
+def test_cocircular_regular_polygon_terminates():
+    # Rounded vertices of a regular polygon far from the origin used to make
+    # both diagonals of a quad look illegal, so the flips cycled forever.
+    angle = 2 * np.pi * np.arange(64) / 64
+    contour = np.stack([1500 + 700 * np.cos(angle), 1500 + 700 * np.sin(angle)], axis=1)
+    _check(contour, _triangulate(contour))
+
+
+def test_lobed_ring_with_cocircular_vertices():
+    angle = 2 * np.pi * np.arange(20000) / 20000
+    radius = 1000 + 300 * np.sin(200 * angle)
+    contour = np.stack([1500 + radius * np.cos(angle), 1500 + radius * np.sin(angle)], axis=1)
+    _check(contour, _triangulate(contour))